@@ -1,10 +1,16 @@
 import streamlit as st
 import os
-from PIL import Image
-import io
-from services.api_service import APIService
-import time
-import mimetypes
+from services.catalog import BODY_PARTS, SYMPTOMS
+from services.chunk_log import get_chunk_log_store
+from services.config import getenv
+from services.diagnosis import analyze_image, stream_final_diagnosis
+from services.image_preprocess import submit_preprocess
+from services.instrumentation import get_recorder
+from services.job_scheduler import JobStatus, QueueFullError, get_job_scheduler
+from services.resilience import is_busy_error
+from services.result_cache import get_result_cache, image_cache_key
+from services.session_state import DiagnosisSession, get_session_store
+from services.stream_render import ThrottledRenderer
 
 # 페이지 설정
 st.set_page_config(
@@ -13,112 +19,102 @@ st.set_page_config(
     layout="wide"
 )
 
-# API 서비스 초기화
-api_service = APIService()
-
-# 세션 상태 초기화
-if 'diagnosis_id' not in st.session_state:
-    st.session_state.diagnosis_id = None
-if 'current_step' not in st.session_state:
-    st.session_state.current_step = 1
-if 'diagnosis_complete' not in st.session_state:
-    st.session_state.diagnosis_complete = False
-if 'selected_body_part' not in st.session_state:
-    st.session_state.selected_body_part = None
-if 'symptoms_submitted' not in st.session_state:
-    st.session_state.symptoms_submitted = False
+@st.cache_resource
+def get_api_service():
+    """API 클라이언트 (프로세스당 한 번, 첫 백엔드 호출 때 생성)
+
+    API_CLIENT=async이면 비동기 클라이언트를 동기 브리지로 사용한다. HTTP 클라이언트
+    라이브러리는 여기서 import하므로 첫 화면 렌더링 시간에 포함되지 않는다.
+    """
+    if getenv("API_CLIENT", "sync").lower() == "async":
+        from services.async_api_service import SyncAPIBridge
+        return SyncAPIBridge()
+    from services.api_service import APIService
+    return APIService()
+
+# 작업 진행 상황을 확인하는 최대 간격 (새 이벤트가 오면 바로 깨어남)
+JOB_POLL_INTERVAL = 0.5
+
+BUSY_MESSAGE = "서버가 혼잡합니다. 잠시 후 다시 시도해주세요."
+
+# 세션 상태 초기화 (진행 상태는 작은 객체 하나로 두고, 업로드 이미지 같은 큰 데이터는
+# 프로세스 공용 세션 저장소에 맡겨 오래 쉬는 세션의 것부터 정리되게 함)
+if 'session' not in st.session_state:
+    st.session_state.session = DiagnosisSession()
+session = st.session_state.session
+get_session_store().touch(session.session_id)
+
+def clear_symptom_widgets():
+    """증상 체크박스 위젯 상태 삭제 (선택 결과는 세션의 비트셋에 남아 있음)"""
+    for key in [key for key in st.session_state if str(key).startswith("symptom_")]:
+        del st.session_state[key]
 
 def reset_session():
-    """세션 상태 초기화"""
-    st.session_state.diagnosis_id = None
-    st.session_state.current_step = 1
-    st.session_state.diagnosis_complete = False
-    st.session_state.selected_body_part = None
-    st.session_state.symptoms_submitted = False
+    """세션 상태 초기화 (진행 중인 최종 진단 작업은 취소하고 이 세션이 잡고 있던 데이터를 모두 놓아줌)"""
+    if session.diagnosis_id:
+        get_job_scheduler().forget(f"rag:{session.diagnosis_id}")
+        get_chunk_log_store().discard(session.diagnosis_id)
+    get_session_store().discard(session.session_id)
+    clear_symptom_widgets()
+    session.reset()
+
+def show_error(e, message="오류가 발생했습니다"):
+    """오류 표시 (백엔드가 혼잡해서 요청을 보내지 않은 경우는 다시 시도 안내)"""
+    if is_busy_error(e):
+        st.warning(BUSY_MESSAGE)
+    else:
+        st.error(f"{message}: {str(e)}")
+
+def submit_analyze_job(image, body_part):
+    """1단계 분석 작업 제출 (세션마다 같은 사진과 부위의 작업은 하나만 실행)
+
+    다른 세션과 작업이나 캐시를 공유하면 같은 diagnosisId를 받아 서로의 증상과 최종 진단을 덮어쓰므로 세션별로 나눈다.
+    """
+    session_id = session.session_id
+    key = f"analyze:{image_cache_key(image.data, body_part, session_id)}"
+    api_service, result_cache = get_api_service(), get_result_cache()
+    get_job_scheduler().submit(
+        key, lambda job: analyze_image(api_service, image, body_part, result_cache, on_progress=job.report,
+                                       session_id=session_id)
+    )
+    return key
+
+def submit_diagnosis_job(diagnosis_id):
+    """최종 진단 스트리밍 작업 제출 (diagnosis_id당 하나만 실행, 청크는 작업 진행 이벤트로 전달)
+
+    받은 청크는 청크 로그에 남기므로 작업이 실패하거나 취소된 뒤 다시 제출하면 이어받는다.
+    """
+    api_service = get_api_service()
+
+    def run(job):
+        stream = stream_final_diagnosis(api_service, diagnosis_id, get_chunk_log_store().open(diagnosis_id),
+                                        check_cancelled=job.check_cancelled)
+        try:
+            for text in stream:
+                job.check_cancelled()
+                job.report(text)
+        finally:
+            stream.close()
+
+    # 스트리밍은 오래 걸리므로 1단계 분석과 다른 풀에서 실행
+    return get_job_scheduler().submit(f"rag:{diagnosis_id}", run, pool="stream")
 
 def process_image_upload():
     """이미지 업로드 및 처리"""
     try:
         uploaded_file = st.file_uploader("피부 사진을 업로드해주세요", type=['jpg', 'jpeg', 'png'])
-        
-        # 부위 카테고리별 그룹화
-        body_part_categories = {
-            "얼굴 부위": [
-                ("얼굴", "FACE"),
-                ("뺨", "CHEEKS"),
-                ("이마", "FOREHEAD"),
-                ("턱", "CHIN"),
-                ("눈", "EYES"),
-                ("눈꺼풀", "EYELIDS"),
-                ("코", "NOSE"),
-                ("입", "MOUTH"),
-                ("입술", "LIPS"),
-                ("귀", "EAR"),
-                ("헤어라인", "HAIRLINE"),
-                ("입안", "INSIDE_THE_MOUTH"),
-                ("입천장", "ROOF_OF_THE_MOUTH"),
-                ("잇몸", "GUMS"),
-                ("혀", "TONGUE")
-            ],
-            "상체 부위": [
-                ("목", "NECK"),
-                ("목구멍", "THROAT"),
-                ("가슴", "CHEST"),
-                ("배", "TUMMY"),
-                ("몸통", "TORSO"),
-                ("등", "BACK"),
-                ("겨드랑이", "ARMPITS"),
-                ("팔", "ARMS"),
-                ("팔꿈치", "ELBOWS"),
-                ("손", "HANDS"),
-                ("손바닥", "PALMS"),
-                ("손목", "WRISTS")
-            ],
-            "하체 부위": [
-                ("다리", "LEGS"),
-                ("무릎", "KNEES"),
-                ("무릎뼈", "KNEECAPS"),
-                ("오금", "BACKS_OF_KNEES"),
-                ("허벅지", "THIGHS"),
-                ("허벅지 안쪽", "INNER_THIGHS"),
-                ("발", "FEET"),
-                ("발바닥", "SOLES"),
-                ("발가락", "TOES"),
-                ("발가락 사이", "BETWEEN_TOES")
-            ],
-            "기타 부위": [
-                ("두피", "SCALP"),
-                ("머리", "HEAD"),
-                ("엉덩이", "BOTTOM"),
-                ("기저귀 부위", "NAPPY_AREA"),
-                ("생식기", "GENITALS"),
-                ("피부 주름", "SKIN_FOLDS"),
-                ("물린 부위 주변 피부", "SKIN_AROUND_THE_BITE"),
-                ("전신", "WHOLE_BODY")
-            ]
-        }
 
-        # 부위 선택 UI
-        st.subheader("피부 부위 선택")
+        # 부위를 고르는 동안 업로드된 사진을 백그라운드에서 축소/재인코딩
+        if uploaded_file and session.preprocess_file_id != uploaded_file.file_id:
+            session.preprocess_file_id = uploaded_file.file_id
+            # UploadedFile은 실행마다 새로 만들어지므로 복사하지 않고 그대로 넘김
+            get_session_store().put(session.session_id, "preprocess", submit_preprocess(uploaded_file),
+                                    uploaded_file.size)
         
-        # 탭 생성
-        tabs = st.tabs(list(body_part_categories.keys()))
-        
-        # 각 탭에 해당하는 부위 표시
-        for tab, (category, parts) in zip(tabs, body_part_categories.items()):
-            with tab:
-                cols = st.columns(4)  # 4열로 구성
-                for i, (name, enum) in enumerate(parts):
-                    with cols[i % 4]:
-                        if st.button(name, key=f"body_part_{enum}"):
-                            st.session_state.selected_body_part = enum
-                            st.experimental_rerun()
-        
-        # 선택된 부위 표시
-        if st.session_state.selected_body_part:
-            st.success(f"선택된 부위: {next((name for name, enum in sum(body_part_categories.values(), []) if enum == st.session_state.selected_body_part), '')}")
+        # 부위 선택 UI
+        body_part_picker()
 
-        if uploaded_file and st.session_state.selected_body_part:
+        if uploaded_file and session.selected_body_part:
             if st.button("진단 시작"):
                 # 이미지 파일 확장자 확인
                 file_extension = os.path.splitext(uploaded_file.name)[1].lower()
@@ -126,148 +122,94 @@ def process_image_upload():
                     st.error("지원하지 않는 파일 형식입니다. JPG 또는 PNG 파일만 업로드 가능합니다.")
                     return
                 
-                # 이미지 업로드
-                with st.spinner("피부 사진 업로드 중..."):
-                    image_bytes = uploaded_file.getvalue()
-                    response = api_service.upload_image(image_bytes, st.session_state.selected_body_part)
-                    st.session_state.diagnosis_id = response.get('diagnosisId')
-                
-                # 이미지 검증
-                with st.spinner("피부 사진 검증 중..."):
-                    validation = api_service.validate_image(st.session_state.diagnosis_id)
-                    if not validation.get('is_skin_related'):
-                        st.error("피부 관련 이미지가 아닙니다. 다른 이미지를 업로드해주세요.")
-                        return
-                
-                # 이미지 분류 및 상태 설명
-                with st.spinner("피부 상태 확인 중..."):
-                    classification = api_service.classify_image(st.session_state.diagnosis_id)
-                    description = api_service.get_image_description(st.session_state.diagnosis_id)
-                
-                st.session_state.current_step = 2
-                st.experimental_rerun()
+                # 이미지 업로드, 검증, 분류 및 상태 설명을 백그라운드 작업으로 제출
+                future = get_session_store().get(session.session_id, "preprocess")
+                if future is None:
+                    # 오래 쉬는 동안 메모리 상한 때문에 내려졌으면 다시 전처리
+                    future = submit_preprocess(uploaded_file)
+                image = future.result()
+                session.analyze_job_key = submit_analyze_job(image, session.selected_body_part)
+                # 이미지는 작업이 끝날 때까지 작업이 잡고 있으므로 세션에서는 놓아줌
+                get_session_store().discard(session.session_id, "preprocess")
+
+        # 제출한 작업이 있으면 (도중에 다시 실행되어도) 이어서 결과를 기다림
+        if session.analyze_job_key:
+            job = get_job_scheduler().get(session.analyze_job_key)
+            if job is None:
+                session.analyze_job_key = None
+                return
+
+            with st.spinner("피부 사진을 분석하고 있습니다..."):
+                stage_container = st.empty()
+                for stage in job.iter_events(poll_interval=JOB_POLL_INTERVAL):
+                    stage_container.caption(stage)
+                stage_container.empty()
+            session.analyze_job_key = None
+            result = job.get_result()
+            session.diagnosis_id = result.get('diagnosisId')
+            
+            if not result["validation"].get('is_skin_related'):
+                st.error("피부 관련 이미지가 아닙니다. 다른 이미지를 업로드해주세요.")
+                return
+            
+            session.current_step = 2
+            st.rerun()
+    except QueueFullError as e:
+        st.warning(str(e))
     except Exception as e:
-        st.error(f"오류가 발생했습니다: {str(e)}")
+        show_error(e)
+
+@st.fragment
+def body_part_picker():
+    """부위 선택 (버튼을 눌러도 이 영역만 다시 실행)"""
+    st.subheader("피부 부위 선택")
+    
+    # 탭 생성
+    tabs = st.tabs(BODY_PARTS.category_names)
+    
+    # 각 탭에 해당하는 부위 표시
+    for tab, (category, parts) in zip(tabs, BODY_PARTS.categories):
+        with tab:
+            cols = st.columns(4)  # 4열로 구성
+            for i, (name, enum) in enumerate(parts):
+                with cols[i % 4]:
+                    if st.button(name, key=f"body_part_{enum}"):
+                        first_selection = session.selected_body_part is None
+                        session.selected_body_part = enum
+                        # 처음 선택했을 때만 진단 시작 버튼을 보여주기 위해 전체 다시 실행
+                        if first_selection:
+                            st.rerun()
+    
+    # 선택된 부위 표시
+    if session.selected_body_part:
+        st.success(f"선택된 부위: {BODY_PARTS.label(session.selected_body_part)}")
+
+@st.fragment
+def symptom_picker():
+    """증상 체크박스 (체크해도 이 영역만 다시 실행)"""
+    # 탭 생성
+    symptom_tabs = st.tabs(SYMPTOMS.category_names)
+    
+    # 각 탭에 해당하는 증상 표시
+    for tab, (category, symptoms) in zip(symptom_tabs, SYMPTOMS.categories):
+        with tab:
+            cols = st.columns(4)  # 4열로 구성
+            for i, (symptom_name, symptom_enum) in enumerate(symptoms):
+                with cols[i % 4]:
+                    st.checkbox(symptom_name, key=f"symptom_{symptom_enum}", on_change=toggle_symptom,
+                                args=(symptom_enum,))
+
+def toggle_symptom(enum):
+    """체크박스 변경을 세션의 증상 비트셋에 반영"""
+    session.set_symptom(enum, st.session_state[f"symptom_{enum}"])
 
 def process_symptoms():
     """증상 입력 처리"""
     try:
-        if not st.session_state.symptoms_submitted:
+        if not session.symptoms_submitted:
             st.subheader("추가 증상 입력")
             
-            # 증상 카테고리별 그룹화
-            symptom_categories = {
-                "피부 관련": [
-                    ("발진", "RASH"),
-                    ("붉은 발진", "RED_RASH"),
-                    ("가려운 발진", "ITCHY_RASH"),
-                    ("여드름성 발진", "PIMPLY_RASH"),
-                    ("고리 모양 발진", "RING_SHAPED_RASH"),
-                    ("번지는 발진", "SPREADING_RASH"),
-                    ("얼룩덜룩한 발진", "BLOTCHY_RASH"),
-                    ("붉은 반점", "RED_SPOTS"),
-                    ("붉은 덩어리", "RED_BUMPS"),
-                    ("가려운 덩어리", "ITCHY_BUMPS"),
-                    ("솟아오른 덩어리", "RAISED_BUMPS"),
-                    ("작은 솟아오른 반점", "TINY_RAISED_SPOTS"),
-                    ("붉은 피부", "RED_SKIN"),
-                    ("붉어짐", "REDNESS"),
-                    ("가려운 피부", "ITCHY_SKIN"),
-                    ("건조한 피부", "DRY_SKIN"),
-                    ("비늘 모양 피부", "SCALY_SKIN"),
-                    ("껍질이 벗겨지는 피부", "FLAKY_SKIN"),
-                    ("피부 벗겨짐", "PEELING_SKIN"),
-                    ("갈라진 피부", "CRACKED_SKIN"),
-                    ("물집", "BLISTERS"),
-                    ("수포", "FLUID_FILLED_BLISTERS"),
-                    ("통증성 물집", "PAINFUL_BLISTERS"),
-                    ("고름 찬 반점", "PUS_FILLED_SPOTS"),
-                    ("작은 물집 같은 염증", "SMALL_BLISTER_LIKE_SORES"),
-                    ("작은 황백색 농포", "SMALL_YELLOW_WHITE_PUSTULES"),
-                    ("여드름", "PIMPLES"),
-                    ("좁쌀 여드름", "WHITEHEADS"),
-                    ("하얀 반점", "WHITE_PATCHES"),
-                    ("비늘 모양 반점", "SCALY_PATCHES"),
-                    ("솟아오른 반점", "RAISED_PATCHES"),
-                    ("염증", "SORES"),
-                    ("굴 같은 자국", "BURROWS"),
-                    ("통증 없는 혹", "PAINLESS_BUMP"),
-                    ("악화 (습진)", "FLARE_UPS_ECZEMA"),
-                    ("만졌을 때 따뜻함", "WARM_TO_TOUCH"),
-                    ("부기", "SWELLING"),
-                    ("출혈", "BLEEDING")
-                ],
-                "눈 관련": [
-                    ("눈 분비물", "DISCHARGE_FROM_EYES"),
-                    ("눈 건조", "DRYNESS_EYES"),
-                    ("눈 자극", "EYE_IRRITATION"),
-                    ("눈의 이물감", "GRITTINESS_EYES"),
-                    ("가려운 눈", "ITCHY_EYES"),
-                    ("부은 눈", "PUFFY_EYES"),
-                    ("눈의 통증", "SORE_EYES"),
-                    ("붉은 눈", "RED_EYES"),
-                    ("눈물", "WATERY_EYES"),
-                    ("결막염", "PINK_EYE"),
-                    ("딱딱한 속눈썹", "CRUSTY_EYELASHES"),
-                    ("끈적거리는 눈꺼풀", "STICKY_EYELIDS")
-                ],
-                "일반 증상": [
-                    ("열", "FEVER"),
-                    ("갑작스러운 발열", "SUDDEN_FEVER"),
-                    ("기침", "COUGH"),
-                    ("콧물", "RUNNY_NOSE"),
-                    ("재채기", "SNEEZING"),
-                    ("목의 통증", "SORE_THROAT"),
-                    ("귀앓이", "EARACHE"),
-                    ("귀 잡아당김", "TUGGING_AT_EAR"),
-                    ("입의 통증", "SORE_MOUTH"),
-                    ("구취", "BAD_BREATH"),
-                    ("혀의 백태", "WHITE_COATING_ON_TONGUE"),
-                    ("부은 잇몸", "SWOLLEN_GUMS"),
-                    ("부은 샘", "SWOLLEN_GLANDS"),
-                    ("부은 림프샘", "SWOLLEN_LYMPH_GLANDS"),
-                    ("부은 목 샘", "SWOLLEN_NECK_GLANDS"),
-                    ("식욕 부진", "LOSS_OF_APPETITE"),
-                    ("수유 거부", "RELUCTANCE_TO_FEED"),
-                    ("설사", "DIARRHOEA"),
-                    ("경미한 설사", "MILD_DIARRHOEA"),
-                    ("메스꺼움", "NAUSEA"),
-                    ("두통", "HEADACHE"),
-                    ("근육통", "MUSCLE_ACHES"),
-                    ("쑤시고 아픔", "ACHES_AND_PAINS"),
-                    ("통증", "PAIN"),
-                    ("쓰림", "SORENESS"),
-                    ("불쾌감", "DISCOMFORT"),
-                    ("피로", "TIREDNESS"),
-                    ("평소와 다른 피로", "UNUSUAL_TIREDNESS"),
-                    ("무기력함", "LETHARGIC"),
-                    ("과민성", "IRRITABILITY"),
-                    ("짜증", "ANNOYANCE"),
-                    ("칭얼거림", "GRIZZLY"),
-                    ("침 흘림", "DROOLING"),
-                    ("청각 곤란", "DIFFICULTY_HEARING"),
-                    ("삼킴 곤란", "DIFFICULTY_SWALLOWING"),
-                    ("독감 유사 증상", "FLU_LIKE_SYMPTOMS"),
-                    ("황달", "JAUNDICE"),
-                    ("알레르기 반응", "ALLERGIC_REACTIONS"),
-                    ("탈모 (두피)", "HAIR_LOSS_SCALP"),
-                    ("기저귀 갈 때 울음", "CRYING_DURING_NAPPY_CHANGES")
-                ]
-            }
-            
-            # 탭 생성
-            symptom_tabs = st.tabs(list(symptom_categories.keys()))
-            
-            selected_symptoms = []
-            
-            # 각 탭에 해당하는 증상 표시
-            for tab, (category, symptoms) in zip(symptom_tabs, symptom_categories.items()):
-                with tab:
-                    cols = st.columns(4)  # 4열로 구성
-                    for i, (symptom_name, symptom_enum) in enumerate(symptoms):
-                        with cols[i % 4]:
-                            if st.checkbox(symptom_name, key=f"symptom_{symptom_enum}"):
-                                selected_symptoms.append(symptom_enum)
+            symptom_picker()
 
             other_symptoms = st.text_area("기타 특이사항이 있다면 입력해주세요")
 
@@ -276,6 +218,7 @@ def process_symptoms():
             
             # 증상 제출 버튼 표시
             if submit_button_container.button("증상 제출"):
+                selected_symptoms = session.selected_symptoms()
                 if not selected_symptoms:
                     st.error("최소 1개 이상의 증상을 선택해주세요.")
                     return
@@ -290,70 +233,131 @@ def process_symptoms():
                     # 증상 처리 중 메시지 표시
                     with loading_container:
                         with st.spinner("증상을 처리하고 있습니다..."):
+                            # 같은 diagnosis_id로 이전에 받은 최종 진단 작업과 청크 로그는 새 증상과 맞지 않으므로 버림
+                            # (캐시된 사진을 다시 올리면 새 세션에서도 같은 diagnosis_id가 나옴)
+                            get_job_scheduler().forget(f"rag:{session.diagnosis_id}")
+                            get_chunk_log_store().discard(session.diagnosis_id)
+
                             # 추가 증상 제출
-                            api_service.submit_symptoms(st.session_state.diagnosis_id, selected_symptoms)
+                            get_api_service().submit_symptoms(session.diagnosis_id, selected_symptoms)
                             
                             # 기타 증상 제출
                             if other_symptoms:
-                                api_service.submit_other_symptoms(st.session_state.diagnosis_id, other_symptoms)
+                                get_api_service().submit_other_symptoms(session.diagnosis_id, other_symptoms)
                             
                             # 증상 제출이 완료된 후에 상태 업데이트
-                            st.session_state.symptoms_submitted = True
-                            st.session_state.current_step = 3
+                            session.symptoms_submitted = True
+                            session.current_step = 3
+                            clear_symptom_widgets()
                             
-                            st.experimental_rerun()
+                            st.rerun()
                 except Exception as e:
-                    st.error(f"증상 제출 중 오류가 발생했습니다: {str(e)}")
+                    show_error(e, "증상 제출 중 오류가 발생했습니다")
     except Exception as e:
-        st.error(f"오류가 발생했습니다: {str(e)}")
+        show_error(e)
 
 def show_diagnosis():
     """최종 진단 결과 표시"""
+    # 이전 UI를 완전히 지우기
+    for _ in range(10):  # 여러 번 empty()를 호출하여 모든 이전 UI 요소를 지움
+        st.empty()
+    
+    st.subheader("진단 결과")
+    diagnosis_stream()
+
+@st.fragment
+def diagnosis_stream():
+    """최종 진단 스트리밍 (이 영역만 독립적으로 다시 실행)"""
     try:
-        # 이전 UI를 완전히 지우기
-        for _ in range(10):  # 여러 번 empty()를 호출하여 모든 이전 UI 요소를 지움
-            st.empty()
-        
-        st.subheader("진단 결과")
-        
         # 스트리밍 응답을 표시할 빈 컨테이너 생성
         result_container = st.empty()
-        full_diagnosis = ""
+        # 청크를 묶어서 일정 간격으로만 다시 그림 (종료/오류 시 남은 내용 반영)
+        renderer = ThrottledRenderer(result_container.write)
         
         # 로딩 애니메이션을 위한 컨테이너
         loading_container = st.empty()
         
-        # 스트리밍 응답 처리
-        with loading_container:
-            with st.spinner("최종 진단 중입니다... 🤔"):
-                for chunk in api_service.get_final_diagnosis(st.session_state.diagnosis_id):
-                    if 'chunk' in chunk:
-                        # 첫 번째 청크가 나오면 로딩 애니메이션 제거
-                        loading_container.empty()
-                        full_diagnosis += chunk['chunk']
-                        result_container.write(full_diagnosis)
+        # 이미 끝난 진단은 청크 로그에서 바로 표시
+        log = get_chunk_log_store().get(session.diagnosis_id)
+        if log is not None and log.complete:
+            loading_container.empty()
+            result_container.write(log.text())
+        else:
+            # 백그라운드 작업이 받은 청크를 처음부터 구독 (다시 실행되어도 백엔드를 다시 호출하지 않음)
+            log = get_chunk_log_store().open(session.diagnosis_id)
+            job = submit_diagnosis_job(session.diagnosis_id)
+            received = 0
+            with loading_container:
+                with st.spinner("최종 진단 중입니다... 🤔"):
+                    with renderer:
+                        # 다음 청크가 늦게 와도 묶어 둔 내용이 min_interval 안에 보이도록 그 간격으로 확인
+                        for text in job.iter_events(poll_interval=renderer.min_interval, on_idle=renderer.tick):
+                            # 첫 번째 청크가 나오면 로딩 애니메이션 제거
+                            if renderer.render_count == 0:
+                                loading_container.empty()
+                            renderer.push(text)
+                            received += 1
+                        # 끝난 작업은 진행 이벤트를 보관하지 않으므로 구독 중 놓친 청크는 청크 로그에서 채움
+                        for text in log.chunks(received):
+                            renderer.push(text)
+            if job.status == JobStatus.CANCELLED:
+                # 이 세션이 취소한 작업은 화면을 다시 그리므로 여기까지 오지 않음 (잘린 결과를 그대로 두지 않도록 안내)
+                st.warning("최종 진단이 중단되었습니다. 아래 버튼으로 새로운 진단을 시작해주세요.")
+            else:
+                job.get_result()
         
         if st.button("새로운 진단 시작하기"):
             reset_session()
-            st.experimental_rerun()
+            st.rerun()
+    except QueueFullError as e:
+        st.warning(str(e))
     except Exception as e:
-        st.error(f"오류가 발생했습니다: {str(e)}")
+        show_error(e)
+
+def render_debug_panel():
+    """사이드바 디버그 패널 (DEBUG_PANEL=1일 때 현재 진단의 백엔드 호출별 소요 시간 표시)"""
+    if getenv("DEBUG_PANEL", "").lower() not in ("1", "true", "yes", "on"):
+        return
+    
+    with st.sidebar:
+        st.subheader("🔧 백엔드 호출 시간")
+        diagnosis_id = session.diagnosis_id
+        if not diagnosis_id:
+            st.caption("진단을 시작하면 호출별 시간이 표시됩니다.")
+            return
+        
+        st.caption(f"diagnosis_id: {diagnosis_id}")
+        rows = []
+        for record in get_recorder().records([diagnosis_id]):
+            rows.append({
+                "호출": record.operation,
+                "연결(ms)": round(record.connect_time * 1000, 1),
+                "첫 바이트(ms)": round(record.ttfb * 1000, 1) if record.ttfb is not None else None,
+                "전체(ms)": round(record.total_time * 1000, 1),
+                "첫 청크(ms)": round(record.first_chunk_time * 1000, 1) if record.first_chunk_time is not None else None,
+                "청크 수": record.chunk_count or None,
+                "바이트": record.bytes_received or None,
+                "오류": record.error,
+            })
+        st.dataframe(rows, hide_index=True)
 
 def main():
     st.title("👶 아기 피부 진단")
     
     # 진행 상태 표시
     steps = ["이미지 업로드", "증상 입력", "진단 결과"]
-    st.progress((st.session_state.current_step - 1) / (len(steps) - 1))
-    st.write(f"현재 단계: {steps[st.session_state.current_step - 1]}")
+    st.progress((session.current_step - 1) / (len(steps) - 1))
+    st.write(f"현재 단계: {steps[session.current_step - 1]}")
     
     # 현재 단계에 따른 처리
-    if st.session_state.current_step == 1:
+    if session.current_step == 1:
         process_image_upload()
-    elif st.session_state.current_step == 2:
+    elif session.current_step == 2:
         process_symptoms()
-    elif st.session_state.current_step == 3:
+    elif session.current_step == 3:
         show_diagnosis()
+    
+    render_debug_panel()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,128 @@
+"""최종 진단 SSE 스트림 처리 마이크로 벤치마크
+
+녹화된(또는 합성한) 대용량 RAG 스트림을 기존 구현(iter_lines + 줄마다 decode/json.loads
++ 문자열 +=, 앱에서 한 번 더 +=)과 새 구현(SSEParser + TextAccumulator)에 재생해 비교한다.
+UI 렌더링 비용은 포함하지 않는다.
+
+    python -m benchmarks.bench_sse
+    python -m benchmarks.bench_sse --record recorded_rag.sse --repeat 20
+    python -m benchmarks.bench_sse --save recorded_rag.sse --chunks 20000
+"""
+import argparse
+import io
+import json
+import statistics
+import sys
+import time
+from typing import Callable, List
+
+import requests
+
+from services.sse import SSEParser, TextAccumulator, parse_json_data
+
+NETWORK_CHUNK_SIZE = 512
+
+
+def synthesize_stream(chunks: int, tokens_per_chunk: int = 3) -> bytes:
+    """RAG 응답과 비슷한 모양의 SSE 스트림 생성"""
+    words = ["아기", "피부", "발진이", "보입니다.", "보습제를", "충분히", "발라주세요.", "**주의**", "\n- "]
+    out = io.BytesIO()
+    for i in range(chunks):
+        text = " ".join(words[(i + j) % len(words)] for j in range(tokens_per_chunk)) + " "
+        out.write(b"data: " + json.dumps({"chunk": text}, ensure_ascii=False).encode("utf-8") + b"\n\n")
+    return out.getvalue()
+
+
+def _response(stream: bytes) -> requests.Response:
+    response = requests.Response()
+    response.status_code = 200
+    response.raw = io.BytesIO(stream)
+    return response
+
+
+def legacy(stream: bytes) -> str:
+    """기존 get_final_diagnosis + show_diagnosis 처리 방식"""
+    def get_final_diagnosis():
+        full_diagnosis = ""
+        for line in _response(stream).iter_lines(chunk_size=NETWORK_CHUNK_SIZE):
+            if line:
+                line = line.decode('utf-8')
+                if line.startswith('data: '):
+                    try:
+                        data = json.loads(line[6:])
+                        if 'chunk' in data:
+                            full_diagnosis += data['chunk']
+                            yield {"chunk": data['chunk']}
+                    except json.JSONDecodeError:
+                        continue
+
+    full_diagnosis = ""
+    for chunk in get_final_diagnosis():
+        full_diagnosis += chunk['chunk']
+    return full_diagnosis
+
+
+def incremental(stream: bytes) -> str:
+    """SSEParser + TextAccumulator 처리 방식"""
+    def get_final_diagnosis():
+        parser = SSEParser()
+        full_diagnosis = TextAccumulator()
+        for event in parser.iter_events(_response(stream).iter_content(chunk_size=NETWORK_CHUNK_SIZE)):
+            data = parse_json_data(event)
+            if data is None:
+                continue
+            if 'chunk' in data:
+                full_diagnosis.append(data['chunk'])
+                yield {"chunk": data['chunk']}
+
+    full_diagnosis = TextAccumulator()
+    for chunk in get_final_diagnosis():
+        full_diagnosis.append(chunk['chunk'])
+    return full_diagnosis.getvalue()
+
+
+def measure(fn: Callable[[bytes], str], stream: bytes, repeat: int) -> List[float]:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(stream)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--record", help="재생할 SSE 녹화 파일 (없으면 합성 스트림 사용)")
+    parser.add_argument("--save", help="합성 스트림을 파일로 저장하고 종료")
+    parser.add_argument("--chunks", type=int, default=10000, help="합성 스트림의 청크 수")
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    if args.record:
+        with open(args.record, "rb") as f:
+            stream = f.read()
+    else:
+        stream = synthesize_stream(args.chunks)
+    if args.save:
+        with open(args.save, "wb") as f:
+            f.write(stream)
+        print(f"saved {len(stream)} bytes to {args.save}")
+        return 0
+
+    if legacy(stream) != incremental(stream):
+        print("출력이 일치하지 않습니다.", file=sys.stderr)
+        return 1
+
+    print(f"stream: {len(stream) / 1024:.1f} KiB, repeat={args.repeat}")
+    baseline = None
+    for name, fn in (("legacy", legacy), ("incremental", incremental)):
+        timings = measure(fn, stream, args.repeat)
+        median = statistics.median(timings)
+        baseline = baseline or median
+        print(f"{name:12s} median {median * 1000:8.2f} ms  min {min(timings) * 1000:8.2f} ms  "
+              f"speedup x{baseline / median:.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,95 @@
+"""콜드 스타트(모듈 import) 시간 측정
+
+새 인터프리터에서 `python -X importtime -c "import <module>"`을 여러 번 실행해
+전체 시간의 중앙값과 누적 import 시간이 큰 모듈, services.* 모듈별 시간을 보여준다.
+--budget-ms를 주면 중앙값이 예산을 넘을 때 종료 코드 1을 반환하므로 CI에서 회귀 검사로 쓸 수 있다.
+
+    python -m benchmarks.bench_startup
+    python -m benchmarks.bench_startup --module services.batch --top 15
+    python -m benchmarks.bench_startup --repeat 10 --budget-ms 600 --json startup.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def parse_importtime(stderr: str) -> Dict[str, Tuple[int, int]]:
+    """-X importtime 출력에서 모듈별 (self, cumulative) 마이크로초"""
+    timings: Dict[str, Tuple[int, int]] = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        timings[name.strip()] = (int(self_us), int(cumulative_us))
+    return timings
+
+
+def measure(module: str) -> Tuple[float, Dict[str, Tuple[int, int]]]:
+    """새 프로세스에서 module을 import하는 데 걸린 시간(초)과 모듈별 import 시간"""
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            cwd=ROOT, capture_output=True, text=True)
+    elapsed = time.perf_counter() - start
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    return elapsed, parse_importtime(result.stderr)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="app", help="import할 모듈 (기본값: app)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10, help="누적 시간이 큰 모듈을 몇 개까지 보여줄지")
+    parser.add_argument("--budget-ms", type=float, help="중앙값이 이 값을 넘으면 실패")
+    parser.add_argument("--json", help="결과를 JSON 파일로 저장")
+    args = parser.parse_args(argv)
+
+    runs: List[Tuple[float, Dict[str, Tuple[int, int]]]] = [measure(args.module) for _ in range(args.repeat)]
+    wall = [elapsed for elapsed, _ in runs]
+    median = statistics.median(wall) * 1000
+    # 모듈별 시간도 실행마다 중앙값을 사용 (디스크 캐시 등으로 첫 실행이 튀는 것을 완화)
+    modules = {
+        name: (statistics.median(timings[name][0] for _, timings in runs if name in timings),
+               statistics.median(timings[name][1] for _, timings in runs if name in timings))
+        for name in runs[-1][1]
+    }
+    top = sorted(modules.items(), key=lambda item: item[1][1], reverse=True)[:args.top]
+    services = sorted(((name, t) for name, t in modules.items() if name.startswith("services")),
+                      key=lambda item: item[1][1], reverse=True)
+
+    print(f"import {args.module}: median {median:.1f} ms  min {min(wall) * 1000:.1f} ms  "
+          f"(repeat={args.repeat}, 인터프리터 시작 포함)")
+    print(f"\n누적 import 시간 상위 {args.top}개")
+    for name, (self_us, cumulative_us) in top:
+        print(f"  {cumulative_us / 1000:8.1f} ms  (self {self_us / 1000:6.1f} ms)  {name}")
+    if services:
+        print("\nservices 모듈")
+        for name, (self_us, cumulative_us) in services:
+            print(f"  {cumulative_us / 1000:8.1f} ms  (self {self_us / 1000:6.1f} ms)  {name}")
+
+    if args.json:
+        report = {
+            "module": args.module,
+            "repeat": args.repeat,
+            "wall_ms": {"median": round(median, 1), "min": round(min(wall) * 1000, 1)},
+            "modules": {name: {"self_ms": round(s / 1000, 2), "cumulative_ms": round(c / 1000, 2)}
+                        for name, (s, c) in sorted(modules.items(), key=lambda item: item[1][1], reverse=True)},
+        }
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+    if args.budget_ms is not None and median > args.budget_ms:
+        print(f"\n예산 초과: {median:.1f} ms > {args.budget_ms:.1f} ms", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,247 @@
+"""종단 간 부하 테스트
+
+N개의 가상 세션이 동시에 업로드 → 증상 입력 → 최종 진단을 반복하며, app.py와 같은
+서비스 경로(image_preprocess, JobScheduler에서 실행하는 diagnosis.analyze_image와
+stream_final_diagnosis, ChunkLog, APIService, ThrottledRenderer)를 사용한다.
+기본값은 프로세스 안에서 대역 서버(benchmarks.mock_backend)를 띄워 사용한다.
+
+    python -m benchmarks.load_test --sessions 20 --iterations 5
+    python -m benchmarks.load_test --sessions 50 --rag-chunks 500 --chunk-rate 100 --json result.json
+    python -m benchmarks.load_test --springboot-url http://staging:8080 --fastapi-url http://staging:8000
+"""
+import argparse
+import io
+import json
+import math
+import os
+import resource
+import statistics
+import sys
+import threading
+import time
+import tracemalloc
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
+from benchmarks.mock_backend import add_config_arguments, config_from_args, start_mock_backend
+
+STEPS = ("upload", "symptoms", "diagnosis")
+
+
+def _percentile(values: List[float], percent: float) -> float:
+    """nearest-rank 백분위수"""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(percent / 100 * len(ordered)) - 1)]
+
+
+def _sample_image(side: int) -> bytes:
+    """부하 테스트용 JPEG 이미지 생성"""
+    from PIL import Image
+
+    image = Image.new("RGB", (side, side))
+    pixels = image.load()
+    for y in range(0, side, 4):
+        for x in range(0, side, 4):
+            pixels[x, y] = (x % 256, y % 256, (x * y) % 256)
+    output = io.BytesIO()
+    image.save(output, format="JPEG", quality=90)
+    return output.getvalue()
+
+
+class LoadTest:
+    def __init__(self, sessions: int, iterations: int, image_bytes: bytes, trace_memory: bool = False):
+        # 대역 서버 URL 환경 변수를 설정한 뒤에 서비스 모듈을 import
+        from services.api_service import APIService
+        from services.chunk_log import get_chunk_log_store
+        from services.image_preprocess import preprocess_image
+        from services.job_scheduler import get_job_scheduler
+
+        self.api_service = APIService()
+        self.preprocess_image = preprocess_image
+        self.scheduler = get_job_scheduler()
+        self.chunk_logs = get_chunk_log_store()
+        self.sessions = sessions
+        self.iterations = iterations
+        self.image_bytes = image_bytes
+        self.trace_memory = trace_memory
+        self.timings: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.completed = 0
+        self._lock = threading.Lock()
+
+    def _record(self, step: str, seconds: float):
+        with self._lock:
+            self.timings[step].append(seconds)
+
+    def _submit_diagnosis_job(self, diagnosis_id: str):
+        """app.submit_diagnosis_job과 같은 방식으로 최종 진단 스트리밍 작업 제출"""
+        from services.diagnosis import stream_final_diagnosis
+
+        def run(job):
+            stream = stream_final_diagnosis(self.api_service, diagnosis_id, self.chunk_logs.open(diagnosis_id),
+                                            check_cancelled=job.check_cancelled)
+            try:
+                for text in stream:
+                    job.check_cancelled()
+                    job.report(text)
+            finally:
+                stream.close()
+
+        return self.scheduler.submit(f"rag:{diagnosis_id}", run, pool="stream")
+
+    def _run_session(self, session_index: int):
+        from services.diagnosis import analyze_image
+        from services.stream_render import ThrottledRenderer
+
+        for iteration in range(self.iterations):
+            step = "upload"
+            try:
+                start = time.perf_counter()
+                image = self.preprocess_image(self.image_bytes)
+                job = self.scheduler.submit(f"analyze:load-{session_index}-{iteration}",
+                                            lambda job: analyze_image(self.api_service, image, "CHEEKS",
+                                                                      on_progress=job.report))
+                result = job.get_result()
+                diagnosis_id = result["diagnosisId"]
+                self._record(step, time.perf_counter() - start)
+
+                step = "symptoms"
+                start = time.perf_counter()
+                self.api_service.submit_symptoms(diagnosis_id, ["RASH", "ITCHY_SKIN"])
+                self.api_service.submit_other_symptoms(diagnosis_id, "밤에 더 심해져요")
+                self._record(step, time.perf_counter() - start)
+
+                step = "diagnosis"
+                start = time.perf_counter()
+                # app.diagnosis_stream처럼 작업의 진행 이벤트를 구독하고 놓친 청크는 청크 로그에서 채움
+                log = self.chunk_logs.open(diagnosis_id)
+                job = self._submit_diagnosis_job(diagnosis_id)
+                received = 0
+                with ThrottledRenderer(lambda text: None) as renderer:
+                    for text in job.iter_events(poll_interval=renderer.min_interval, on_idle=renderer.tick):
+                        renderer.push(text)
+                        received += 1
+                    for text in log.chunks(received):
+                        renderer.push(text)
+                job.get_result()
+                self._record(step, time.perf_counter() - start)
+                # "새로운 진단 시작하기"처럼 작업과 청크 로그를 정리
+                self.scheduler.forget(f"rag:{diagnosis_id}")
+                self.chunk_logs.discard(diagnosis_id)
+                with self._lock:
+                    self.completed += 1
+            except Exception:
+                with self._lock:
+                    self.errors[step] += 1
+
+    def run(self) -> Dict[str, object]:
+        # tracemalloc은 할당마다 비용이 커서 지연 시간을 왜곡하므로 요청한 경우에만 사용
+        if self.trace_memory:
+            tracemalloc.start()
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.sessions, thread_name_prefix="load-session") as executor:
+            list(executor.map(self._run_session, range(self.sessions)))
+        elapsed = time.perf_counter() - start
+        peak_traced = None
+        if self.trace_memory:
+            _, peak_traced = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+        steps = {}
+        for step in STEPS:
+            values = self.timings.get(step, [])
+            if values:
+                steps[step] = {
+                    "count": len(values),
+                    "errors": self.errors.get(step, 0),
+                    "p50_ms": _percentile(values, 50) * 1000,
+                    "p95_ms": _percentile(values, 95) * 1000,
+                    "p99_ms": _percentile(values, 99) * 1000,
+                    "mean_ms": statistics.mean(values) * 1000,
+                }
+            else:
+                steps[step] = {"count": 0, "errors": self.errors.get(step, 0)}
+        # Linux의 ru_maxrss 단위는 KiB
+        max_rss_kib = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return {
+            "sessions": self.sessions,
+            "iterations": self.iterations,
+            "completed": self.completed,
+            "elapsed_s": elapsed,
+            "throughput_per_s": self.completed / elapsed if elapsed else 0.0,
+            "steps": steps,
+            "client_peak_traced_mib": peak_traced / 2 ** 20 if peak_traced is not None else None,
+            "client_max_rss_mib": max_rss_kib / 1024,
+            "pool": self.api_service.pool_stats(),
+            "resilience": self.api_service.resilience_stats(),
+            "jobs": self.scheduler.stats(),
+        }
+
+
+def print_report(report: Dict[str, object]):
+    print(f"sessions={report['sessions']} iterations={report['iterations']} "
+          f"completed={report['completed']} elapsed={report['elapsed_s']:.2f}s "
+          f"throughput={report['throughput_per_s']:.2f} diagnoses/s")
+    print(f"{'step':10s} {'count':>6s} {'errors':>6s} {'p50 ms':>9s} {'p95 ms':>9s} {'p99 ms':>9s}")
+    for step, stats in report["steps"].items():
+        if stats["count"]:
+            print(f"{step:10s} {stats['count']:6d} {stats['errors']:6d} "
+                  f"{stats['p50_ms']:9.1f} {stats['p95_ms']:9.1f} {stats['p99_ms']:9.1f}")
+        else:
+            print(f"{step:10s} {0:6d} {stats['errors']:6d}")
+    memory = f"client memory: max RSS {report['client_max_rss_mib']:.1f} MiB"
+    if report["client_peak_traced_mib"] is not None:
+        memory += f", peak traced {report['client_peak_traced_mib']:.1f} MiB"
+    print(memory)
+    for backend, stats in report["pool"].items():
+        print(f"pool {backend}: reuse {stats['reuse_ratio']:.2%}, "
+              f"avg wait {stats['wait_time_avg'] * 1000:.2f} ms, retries {stats['retries']}")
+    for backend, stats in report["resilience"].items():
+        print(f"limiter {backend}: circuit {stats['state']}, limit {stats['limit']}, rejected {stats['rejected']}")
+    jobs = report["jobs"]
+    print(f"jobs: succeeded {jobs['succeeded']}, failed {jobs['failed']}, cancelled {jobs['cancelled']}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=10, help="동시 세션 수")
+    parser.add_argument("--iterations", type=int, default=3, help="세션당 진단 횟수")
+    parser.add_argument("--image-side", type=int, default=2000, help="업로드 이미지 한 변 픽셀 수")
+    parser.add_argument("--springboot-url", help="대역 서버 대신 사용할 Spring Boot 주소")
+    parser.add_argument("--fastapi-url", help="대역 서버 대신 사용할 FastAPI 주소")
+    parser.add_argument("--trace-memory", action="store_true", help="tracemalloc으로 Python 할당 최대치 측정")
+    parser.add_argument("--json", dest="json_path", help="결과를 JSON 파일로 저장")
+    add_config_arguments(parser)
+    args = parser.parse_args(argv)
+
+    server = None
+    if args.springboot_url and args.fastapi_url:
+        os.environ["SPRINGBOOT_API_URL"] = args.springboot_url
+        os.environ["FASTAPI_API_URL"] = args.fastapi_url
+    else:
+        server, base_url = start_mock_backend(config_from_args(args))
+        os.environ["SPRINGBOOT_API_URL"] = os.environ["FASTAPI_API_URL"] = base_url
+    # 동시 세션 수만큼 커넥션을 유지하도록 풀 크기 기본값 조정
+    os.environ.setdefault("API_POOL_MAXSIZE", str(max(10, args.sessions)))
+    # 혼잡 제어가 아니라 백엔드를 측정하도록 동시 요청 상한도 세션 수에 맞춤
+    os.environ.setdefault("CONCURRENCY_INITIAL_LIMIT", str(max(32, args.sessions * 2)))
+    # 작업 워커 수는 앱 설정 그대로 두고, 세션 수가 많아도 큐가 넘쳐 거절되지 않게만 함
+    os.environ.setdefault("JOB_QUEUE_SIZE", str(max(32, args.sessions * 2)))
+
+    try:
+        report = LoadTest(args.sessions, args.iterations, _sample_image(args.image_side),
+                          trace_memory=args.trace_memory).run()
+    finally:
+        if server is not None:
+            server.shutdown()
+
+    print_report(report)
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return 0 if not any(stats["errors"] for stats in report["steps"].values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
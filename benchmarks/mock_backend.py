@@ -0,0 +1,226 @@
+"""Spring Boot / FastAPI 백엔드 대역 서버
+
+APIService가 사용하는 7개 엔드포인트(SSE /api/v1/diagnosis/rag 포함)를 한 서버에서 제공한다.
+지연 시간, 청크 속도, 응답 크기를 조절할 수 있어 실제 백엔드 없이 app.py를 실행하거나
+부하 테스트(benchmarks.load_test)를 돌릴 때 사용한다.
+
+    python -m benchmarks.mock_backend --port 8080 --latency 0.05 --rag-chunks 300
+    SPRINGBOOT_API_URL=http://localhost:8080 FASTAPI_API_URL=http://localhost:8080 streamlit run app.py
+"""
+import argparse
+import json
+import random
+import socket
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional, Tuple
+
+
+@dataclass
+class MockConfig:
+    """대역 서버 동작 설정"""
+    latency: float = 0.05          # 일반 엔드포인트 응답 지연 (초)
+    jitter: float = 0.2            # 지연 시간의 무작위 편차 비율
+    rag_first_chunk: float = 0.5   # RAG 첫 청크까지의 지연 (초)
+    rag_chunks: int = 200          # RAG 청크 수
+    chunk_rate: float = 50.0       # 초당 청크 수 (0이면 지연 없이 전송)
+    chunk_size: int = 12           # 청크당 글자 수
+    payload_size: int = 500        # 이미지 설명 응답 글자 수
+    skin_related: bool = True      # validate 응답의 is_skin_related 값
+
+
+_TEXT = "아기 피부에 붉은 발진이 보입니다. 보습제를 충분히 발라주시고 증상이 계속되면 병원을 방문하세요. "
+
+
+def _text(length: int, offset: int = 0) -> str:
+    repeated = _TEXT * (length // len(_TEXT) + 2)
+    start = offset % len(_TEXT)
+    return repeated[start:start + length]
+
+
+class MockBackendHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "BabyCareMockBackend/1.0"
+    config: MockConfig = MockConfig()
+
+    def setup(self):
+        super().setup()
+        # 헤더와 본문을 따로 보낼 때 Nagle 지연이 생기지 않도록
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def log_message(self, format, *args):
+        pass
+
+    def _sleep(self, seconds: float):
+        if seconds > 0:
+            jitter = self.config.jitter
+            time.sleep(seconds * random.uniform(1 - jitter, 1 + jitter))
+
+    def _read_body(self) -> bytes:
+        if self.headers.get("Transfer-Encoding", "").lower() == "chunked":
+            body = bytearray()
+            while True:
+                size = int(self.rfile.readline().split(b";")[0], 16)
+                if size == 0:
+                    self.rfile.readline()
+                    return bytes(body)
+                body += self.rfile.read(size)
+                self.rfile.readline()
+        return self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+    def _json_body(self, body: bytes) -> Dict[str, Any]:
+        try:
+            return json.loads(body or b"{}")
+        except ValueError:
+            return {}
+
+    def _send_json(self, payload: Optional[Dict[str, Any]], status: int = 200):
+        body = b"" if payload is None else json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        if payload is not None:
+            self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        body = self._read_body()
+        route = self.path.split("?")[0]
+        handler = self.ROUTES.get(route)
+        if handler is None:
+            self._send_json({"detail": "Not Found"}, status=404)
+            return
+        handler(self, body)
+
+    def upload(self, body: bytes):
+        self._sleep(self.config.latency)
+        self._send_json({"diagnosisId": str(uuid.uuid4()), "imageSize": len(body)})
+
+    def validate(self, body: bytes):
+        self._sleep(self.config.latency)
+        self._send_json({"is_skin_related": self.config.skin_related})
+
+    def classify(self, body: bytes):
+        self._sleep(self.config.latency)
+        data = self._json_body(body)
+        self._send_json({"diagnosisId": data.get("diagnosisId"), "condition": "ECZEMA", "confidence": 0.87})
+
+    def describe(self, body: bytes):
+        self._sleep(self.config.latency)
+        self._send_json({"description": _text(self.config.payload_size)})
+
+    def symptom(self, body: bytes):
+        self._sleep(self.config.latency)
+        self._send_json(None)
+
+    def other_symptom(self, body: bytes):
+        self._sleep(self.config.latency)
+        self._send_json({"status": "success"})
+
+    def rag(self, body: bytes):
+        config = self.config
+        # Last-Event-ID가 있으면 그 다음 청크부터 이어서 전송
+        try:
+            start = int(self.headers.get("Last-Event-ID", "-1")) + 1
+        except ValueError:
+            start = 0
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        def write(data: bytes):
+            self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+            self.wfile.flush()
+
+        self._sleep(config.rag_first_chunk)
+        interval = 1.0 / config.chunk_rate if config.chunk_rate > 0 else 0.0
+        write(b"retry: 1000\n\n")
+        try:
+            for i in range(start, config.rag_chunks):
+                chunk = _text(config.chunk_size, offset=i * config.chunk_size)
+                event = json.dumps({"chunk": chunk}, ensure_ascii=False)
+                write(f"id: {i}\ndata: {event}\n\n".encode("utf-8"))
+                if interval:
+                    time.sleep(interval)
+            write(b"")
+        except (BrokenPipeError, ConnectionResetError):
+            # 클라이언트가 스트림을 중간에 끊은 경우
+            self.close_connection = True
+
+    ROUTES = {
+        "/api/v1/diagnosis/image-upload": upload,
+        "/api/v1/diagnosis/validate": validate,
+        "/api/v1/diagnosis/classify": classify,
+        "/api/v1/diagnosis/image-description": describe,
+        "/api/v1/diagnosis/symptom": symptom,
+        "/api/v1/diagnosis/other-symptom": other_symptom,
+        "/api/v1/diagnosis/rag": rag,
+    }
+
+
+class MockBackendServer(ThreadingHTTPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+    request_queue_size = 1024
+
+
+def start_mock_backend(config: Optional[MockConfig] = None, host: str = "127.0.0.1",
+                       port: int = 0) -> Tuple[MockBackendServer, str]:
+    """백그라운드 스레드에서 대역 서버를 시작하고 (서버, 기본 URL) 반환"""
+    handler = type("ConfiguredMockBackendHandler", (MockBackendHandler,), {"config": config or MockConfig()})
+    server = MockBackendServer((host, port), handler)
+    threading.Thread(target=server.serve_forever, name="mock-backend", daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+def add_config_arguments(parser: argparse.ArgumentParser):
+    """MockConfig 필드를 명령행 인자로 등록"""
+    defaults = MockConfig()
+    parser.add_argument("--latency", type=float, default=defaults.latency, help="일반 엔드포인트 지연 (초)")
+    parser.add_argument("--jitter", type=float, default=defaults.jitter, help="지연 편차 비율")
+    parser.add_argument("--rag-first-chunk", type=float, default=defaults.rag_first_chunk, help="RAG 첫 청크 지연 (초)")
+    parser.add_argument("--rag-chunks", type=int, default=defaults.rag_chunks, help="RAG 청크 수")
+    parser.add_argument("--chunk-rate", type=float, default=defaults.chunk_rate, help="초당 RAG 청크 수")
+    parser.add_argument("--chunk-size", type=int, default=defaults.chunk_size, help="청크당 글자 수")
+    parser.add_argument("--payload-size", type=int, default=defaults.payload_size, help="이미지 설명 글자 수")
+    parser.add_argument("--not-skin", action="store_true", help="validate가 피부 이미지가 아니라고 응답")
+
+
+def config_from_args(args: argparse.Namespace) -> MockConfig:
+    return MockConfig(
+        latency=args.latency,
+        jitter=args.jitter,
+        rag_first_chunk=args.rag_first_chunk,
+        rag_chunks=args.rag_chunks,
+        chunk_rate=args.chunk_rate,
+        chunk_size=args.chunk_size,
+        payload_size=args.payload_size,
+        skin_related=not args.not_skin,
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    add_config_arguments(parser)
+    args = parser.parse_args(argv)
+
+    handler = type("ConfiguredMockBackendHandler", (MockBackendHandler,), {"config": config_from_args(args)})
+    server = MockBackendServer((args.host, args.port), handler)
+    print(f"mock backend listening on http://{args.host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
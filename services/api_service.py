@@ -1,108 +1,164 @@
-import requests
-import json
+import time
 from typing import Dict, Any, Optional
-import os
-from dotenv import load_dotenv
-import mimetypes
 
-load_dotenv()
+from services.config import getenv
+from services.http_pool import PoolConfig, get_pooled_session, is_retryable_error
+from services.instrumentation import Instrumentation, get_instrumentation
+from services.multipart import ImageSource, MultipartEncoder
+from services.resilience import ResilienceConfig, get_backend_guard
+from services.sse import SSEParser, TextAccumulator, parse_json_data
+
 
 class APIService:
-    def __init__(self):
-        self.springboot_base_url = os.getenv("SPRINGBOOT_API_URL", "http://localhost:8080")
-        self.fastapi_base_url = os.getenv("FASTAPI_API_URL", "http://localhost:8000")
+    def __init__(self, pool_config: Optional[PoolConfig] = None,
+                 instrumentation: Optional[Instrumentation] = None,
+                 resilience_config: Optional[ResilienceConfig] = None):
+        self.springboot_base_url = getenv("SPRINGBOOT_API_URL", "http://localhost:8080")
+        self.fastapi_base_url = getenv("FASTAPI_API_URL", "http://localhost:8000")
+        # 백엔드별로 프로세스 전체가 공유하는 keep-alive 커넥션 풀
+        self.pool_config = pool_config or PoolConfig.from_env()
+        self.springboot_session = get_pooled_session(self.springboot_base_url, self.pool_config)
+        self.fastapi_session = get_pooled_session(self.fastapi_base_url, self.pool_config)
+        self.sessions = {"springboot": self.springboot_session, "fastapi": self.fastapi_session}
+        # 호출별 연결/첫 바이트/전체 시간 측정 (diagnosis_id로 상관관계 추적)
+        self.instrumentation = instrumentation or get_instrumentation()
+        # 백엔드별 회로 차단기와 동시 요청 제한 (혼잡하면 BackendBusyError로 바로 거절)
+        self.guards = {
+            "springboot": get_backend_guard("springboot", self.springboot_base_url, resilience_config),
+            "fastapi": get_backend_guard("fastapi", self.fastapi_base_url, resilience_config),
+        }
 
-    def upload_image(self, image_file: bytes, body_part: str) -> Dict[str, Any]:
-        """이미지 업로드 API 호출"""
-        url = f"{self.springboot_base_url}/api/v1/diagnosis/image-upload"
-        
-        # 파일 확장자에 따른 Content-Type 설정
-        content_type = mimetypes.guess_type('image.jpg')[0]  # 기본값으로 image/jpeg 설정
-        if isinstance(image_file, bytes):
-            if image_file.startswith(b'\xff\xd8'):  # JPEG 시그니처
-                content_type = 'image/jpeg'
-            elif image_file.startswith(b'\x89PNG'):  # PNG 시그니처
-                content_type = 'image/png'
-        
-        files = {
-            'image': ('image.jpg', image_file, content_type)
+    def _post(self, backend: str, path: str, operation: str, diagnosis_id: Optional[str],
+              idempotent: bool = False, **kwargs):
+        """측정과 혼잡 제어를 포함한 POST 호출 (오류 상태 코드는 예외로 변환)
+
+        멱등 호출은 5xx 응답과 요청 도중 끊긴 연결에 대해 백오프 재시도한다. 회로 차단기와 동시 요청
+        제한은 시도마다 적용하므로 실패한 시도는 각각 실패로 기록되고, 회로가 열리면 재시도를 멈춘다.
+        """
+        session = self.sessions[backend]
+        attempt = 0
+        with self.instrumentation.start(operation, backend, diagnosis_id) as call:
+            while True:
+                try:
+                    with self.guards[backend].call(operation) as guarded:
+                        response = session.post(path, **kwargs)
+                        call.observe_response(response)
+                        guarded.observe(response)
+                        response.raise_for_status()
+                        return response
+                except Exception as e:
+                    if not idempotent or attempt >= self.pool_config.max_retries or not is_retryable_error(e):
+                        raise
+                time.sleep(session.retry_delay(attempt))
+                attempt += 1
+
+    def pool_stats(self) -> Dict[str, Dict[str, Any]]:
+        """백엔드별 커넥션 풀 통계 (재사용 비율, 대기 시간 등)"""
+        return {
+            "springboot": self.springboot_session.stats.snapshot(),
+            "fastapi": self.fastapi_session.stats.snapshot(),
         }
-        data = {"bodyPart": body_part}
+
+    def resilience_stats(self) -> Dict[str, Dict[str, Any]]:
+        """백엔드별 회로 상태와 동시 요청 상한"""
+        return {backend: guard.snapshot() for backend, guard in self.guards.items()}
+
+    def upload_image(self, image_file: ImageSource, body_part: str, filename: str = 'image.jpg',
+                     content_type: Optional[str] = None) -> Dict[str, Any]:
+        """이미지 업로드 API 호출
+
+        image_file은 bytes, memoryview 또는 BytesIO 같은 파일 객체이며, multipart 본문을
+        조각 단위로 보내므로 본문 전체를 메모리에 다시 만들지 않는다. content_type이 없으면
+        앞부분 바이트로 판별한다.
+        """
+        encoder = MultipartEncoder({"bodyPart": body_part}, "image", image_file, filename, content_type)
         
-        response = requests.post(url, files=files, data=data)
-        response.raise_for_status()
-        return response.json()
+        with encoder, self.guards["springboot"].call("upload_image") as guarded, \
+                self.instrumentation.start("upload_image", "springboot") as call:
+            response = self.springboot_session.post("/api/v1/diagnosis/image-upload", data=encoder,
+                                                    headers=encoder.headers)
+            call.observe_response(response)
+            guarded.observe(response)
+            response.raise_for_status()
+            result = response.json()
+            call.diagnosis_id = result.get('diagnosisId')
+        return result
 
     def validate_image(self, diagnosis_id: str) -> Dict[str, Any]:
         """이미지 검증 API 호출"""
-        url = f"{self.fastapi_base_url}/api/v1/diagnosis/validate"
         data = {"diagnosis_id": diagnosis_id}
-        response = requests.post(url, json=data)
-        response.raise_for_status()
+        response = self._post("fastapi", "/api/v1/diagnosis/validate", "validate_image", diagnosis_id,
+                              idempotent=True, json=data)
         return response.json()
 
     def classify_image(self, diagnosis_id: str) -> Dict[str, Any]:
         """이미지 분류 API 호출"""
-        url = f"{self.springboot_base_url}/api/v1/diagnosis/classify"
         data = {"diagnosisId": diagnosis_id}
-        response = requests.post(url, json=data)
-        response.raise_for_status()
+        response = self._post("springboot", "/api/v1/diagnosis/classify", "classify_image", diagnosis_id,
+                              idempotent=True, json=data)
         return response.json()
 
     def get_image_description(self, diagnosis_id: str) -> Dict[str, Any]:
         """이미지 상태 설명 API 호출"""
-        url = f"{self.fastapi_base_url}/api/v1/diagnosis/image-description"
         data = {"diagnosis_id": diagnosis_id}
-        response = requests.post(url, json=data)
-        response.raise_for_status()
+        response = self._post("fastapi", "/api/v1/diagnosis/image-description", "get_image_description",
+                              diagnosis_id, idempotent=True, json=data)
         return response.json()
 
     def submit_symptoms(self, diagnosis_id: str, symptoms: list) -> Dict[str, Any]:
         """추가 증상 입력 API 호출"""
-        url = f"{self.springboot_base_url}/api/v1/diagnosis/symptom"
         data = {
             "diagnosisId": diagnosis_id,
             "symptoms": symptoms
         }
-        response = requests.post(url, json=data)
-        response.raise_for_status()
+        self._post("springboot", "/api/v1/diagnosis/symptom", "submit_symptoms", diagnosis_id, json=data)
         # 빈 응답이 오는 경우 성공으로 처리
         return {"status": "success", "message": "증상이 성공적으로 저장되었습니다."}
 
     def submit_other_symptoms(self, diagnosis_id: str, other_symptoms: str) -> Dict[str, Any]:
         """기타 증상 입력 API 호출"""
-        url = f"{self.fastapi_base_url}/api/v1/diagnosis/other-symptom"
         data = {
             "diagnosis_id": diagnosis_id,
             "other_symptom_text": other_symptoms
         }
-        response = requests.post(url, json=data)
-        response.raise_for_status()
+        response = self._post("fastapi", "/api/v1/diagnosis/other-symptom", "submit_other_symptoms",
+                              diagnosis_id, json=data)
         return response.json()
 
-    def get_final_diagnosis(self, diagnosis_id: str) -> Dict[str, Any]:
-        """최종 진단 API 호출"""
-        url = f"{self.fastapi_base_url}/api/v1/diagnosis/rag"
+    def get_final_diagnosis(self, diagnosis_id: str, last_event_id: Optional[str] = None) -> Dict[str, Any]:
+        """최종 진단 API 호출 (last_event_id가 있으면 그 다음 이벤트부터 이어받기)"""
         data = {"diagnosis_id": diagnosis_id}
+        headers = {"Last-Event-ID": last_event_id} if last_event_id is not None else None
         
-        # SSE 응답을 처리하기 위한 요청
-        response = requests.post(url, json=data, stream=True)
-        response.raise_for_status()
-        
-        # SSE 응답 처리
-        full_diagnosis = ""
-        for line in response.iter_lines():
-            if line:
-                line = line.decode('utf-8')
-                if line.startswith('data: '):
-                    try:
-                        data = json.loads(line[6:])  # 'data: ' 이후의 JSON 파싱
-                        if 'chunk' in data:
-                            full_diagnosis += data['chunk']
-                            yield {"chunk": data['chunk']}  # 각 청크를 실시간으로 반환
-                        elif 'error' in data:
-                            raise Exception(data['error'])
-                    except json.JSONDecodeError:
+        # 스트림이 끝날 때까지 동시 요청 자리를 차지하고, 지연 시간 표본은 첫 바이트까지의 시간
+        with self.guards["fastapi"].call("get_final_diagnosis") as guarded, \
+                self.instrumentation.start("get_final_diagnosis", "fastapi", diagnosis_id) as call:
+            # SSE 응답을 처리하기 위한 요청
+            response = self.fastapi_session.post("/api/v1/diagnosis/rag", json=data, headers=headers, stream=True)
+            call.observe_response(response)
+            guarded.observe(response)
+            response.raise_for_status()
+            
+            # SSE 응답 처리 (중간에 중단되어도 커넥션을 풀에 반환)
+            parser = SSEParser()
+            full_diagnosis = TextAccumulator()
+
+            def observed_chunks():
+                for raw in response.iter_content(chunk_size=None):
+                    call.observe_chunk(len(raw))
+                    yield raw
+
+            try:
+                for event in parser.iter_events(observed_chunks()):
+                    data = parse_json_data(event)
+                    if data is None:
                         continue
+                    if 'chunk' in data:
+                        full_diagnosis.append(data['chunk'])
+                        yield {"chunk": data['chunk'], "id": event.id}  # 각 청크를 실시간으로 반환
+                    elif 'error' in data:
+                        raise Exception(data['error'])
+            finally:
+                response.close()
         
-        return {"diagnosis": full_diagnosis} 
\ No newline at end of file
+        return {"diagnosis": full_diagnosis.getvalue()}
\ No newline at end of file
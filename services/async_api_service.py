@@ -0,0 +1,202 @@
+import asyncio
+import threading
+from typing import Any, AsyncIterator, Awaitable, Dict, Iterator, Optional, TypeVar
+
+import httpx
+
+from services.config import getenv
+from services.http_pool import PoolConfig, RETRY_STATUS_CODES
+from services.multipart import ImageSource, MultipartEncoder
+from services.sse import SSEParser, parse_json_data
+
+T = TypeVar("T")
+
+
+class AsyncAPIService:
+    """APIService와 같은 7개 API를 제공하는 비동기 클라이언트"""
+
+    def __init__(self, pool_config: Optional[PoolConfig] = None):
+        self.springboot_base_url = getenv("SPRINGBOOT_API_URL", "http://localhost:8080").rstrip("/")
+        self.fastapi_base_url = getenv("FASTAPI_API_URL", "http://localhost:8000").rstrip("/")
+        self.pool_config = pool_config or PoolConfig.from_env()
+        self._client: Optional[httpx.AsyncClient] = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """두 백엔드가 함께 쓰는 커넥션 풀 (이벤트 루프 안에서 처음 사용할 때 생성)"""
+        if self._client is None:
+            config = self.pool_config
+            self._client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=config.pool_maxsize * 2,
+                    max_keepalive_connections=config.pool_maxsize * 2,
+                ),
+                timeout=httpx.Timeout(config.read_timeout, connect=config.connect_timeout),
+                # 연결 실패는 요청이 전송되기 전이므로 모든 메서드에서 재시도
+                transport=httpx.AsyncHTTPTransport(retries=config.max_retries),
+            )
+        return self._client
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _post(self, url: str, idempotent: bool = False, **kwargs) -> httpx.Response:
+        """POST 요청 (멱등 호출은 5xx 응답과 요청 도중 끊긴 연결에 대해 백오프 재시도)
+
+        연결 실패는 transport에서만 재시도하고, 타임아웃은 재시도하지 않는다.
+        """
+        attempt = 0
+        while True:
+            try:
+                response = await self.client.post(url, **kwargs)
+            except (httpx.ReadError, httpx.WriteError, httpx.RemoteProtocolError):
+                if not idempotent or attempt >= self.pool_config.max_retries:
+                    raise
+            else:
+                if (not idempotent or response.status_code not in RETRY_STATUS_CODES
+                        or attempt >= self.pool_config.max_retries):
+                    return response
+            await asyncio.sleep(self.pool_config.retry_backoff * (2 ** attempt))
+            attempt += 1
+
+    async def upload_image(self, image_file: ImageSource, body_part: str, filename: str = 'image.jpg',
+                           content_type: Optional[str] = None) -> Dict[str, Any]:
+        """이미지 업로드 API 호출 (multipart 본문을 조각 단위로 전송)"""
+        url = f"{self.springboot_base_url}/api/v1/diagnosis/image-upload"
+
+        with MultipartEncoder({"bodyPart": body_part}, "image", image_file, filename, content_type) as encoder:
+            response = await self._post(url, content=encoder.aiter_chunks(), headers=encoder.headers)
+        response.raise_for_status()
+        return response.json()
+
+    async def validate_image(self, diagnosis_id: str) -> Dict[str, Any]:
+        """이미지 검증 API 호출"""
+        url = f"{self.fastapi_base_url}/api/v1/diagnosis/validate"
+        response = await self._post(url, idempotent=True, json={"diagnosis_id": diagnosis_id})
+        response.raise_for_status()
+        return response.json()
+
+    async def classify_image(self, diagnosis_id: str) -> Dict[str, Any]:
+        """이미지 분류 API 호출"""
+        url = f"{self.springboot_base_url}/api/v1/diagnosis/classify"
+        response = await self._post(url, idempotent=True, json={"diagnosisId": diagnosis_id})
+        response.raise_for_status()
+        return response.json()
+
+    async def get_image_description(self, diagnosis_id: str) -> Dict[str, Any]:
+        """이미지 상태 설명 API 호출"""
+        url = f"{self.fastapi_base_url}/api/v1/diagnosis/image-description"
+        response = await self._post(url, idempotent=True, json={"diagnosis_id": diagnosis_id})
+        response.raise_for_status()
+        return response.json()
+
+    async def submit_symptoms(self, diagnosis_id: str, symptoms: list) -> Dict[str, Any]:
+        """추가 증상 입력 API 호출"""
+        url = f"{self.springboot_base_url}/api/v1/diagnosis/symptom"
+        data = {
+            "diagnosisId": diagnosis_id,
+            "symptoms": symptoms
+        }
+        response = await self._post(url, json=data)
+        response.raise_for_status()
+        # 빈 응답이 오는 경우 성공으로 처리
+        return {"status": "success", "message": "증상이 성공적으로 저장되었습니다."}
+
+    async def submit_other_symptoms(self, diagnosis_id: str, other_symptoms: str) -> Dict[str, Any]:
+        """기타 증상 입력 API 호출"""
+        url = f"{self.fastapi_base_url}/api/v1/diagnosis/other-symptom"
+        data = {
+            "diagnosis_id": diagnosis_id,
+            "other_symptom_text": other_symptoms
+        }
+        response = await self._post(url, json=data)
+        response.raise_for_status()
+        return response.json()
+
+    async def get_final_diagnosis(self, diagnosis_id: str,
+                                  last_event_id: Optional[str] = None) -> AsyncIterator[Dict[str, Any]]:
+        """최종 진단 API 호출 (SSE 청크를 비동기로 반환, last_event_id가 있으면 이어받기)"""
+        url = f"{self.fastapi_base_url}/api/v1/diagnosis/rag"
+        headers = {"Last-Event-ID": last_event_id} if last_event_id is not None else None
+        async with self.client.stream("POST", url, json={"diagnosis_id": diagnosis_id}, headers=headers) as response:
+            response.raise_for_status()
+            parser = SSEParser()
+
+            async def events():
+                async for raw in response.aiter_bytes():
+                    for event in parser.feed(raw):
+                        yield event
+                for event in parser.close():
+                    yield event
+
+            async for event in events():
+                data = parse_json_data(event)
+                if data is None:
+                    continue
+                if 'chunk' in data:
+                    yield {"chunk": data['chunk'], "id": event.id}
+                elif 'error' in data:
+                    raise Exception(data['error'])
+
+
+class SyncAPIBridge:
+    """AsyncAPIService를 기존 동기 코드에서 APIService처럼 쓰기 위한 브리지
+
+    모든 세션이 백그라운드 스레드 하나의 이벤트 루프와 커넥션 풀을 공유하므로
+    백엔드 대기 중에는 스레드를 추가로 점유하지 않는다.
+    """
+
+    _loop: Optional[asyncio.AbstractEventLoop] = None
+    _loop_lock = threading.Lock()
+
+    def __init__(self, service: Optional[AsyncAPIService] = None):
+        self.service = service or AsyncAPIService()
+        self.springboot_base_url = self.service.springboot_base_url
+        self.fastapi_base_url = self.service.fastapi_base_url
+
+    @classmethod
+    def _get_loop(cls) -> asyncio.AbstractEventLoop:
+        with cls._loop_lock:
+            if cls._loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="api-event-loop", daemon=True).start()
+                cls._loop = loop
+            return cls._loop
+
+    def _run(self, coro: Awaitable[T]) -> T:
+        return asyncio.run_coroutine_threadsafe(coro, self._get_loop()).result()
+
+    def _iterate(self, agen: AsyncIterator[T]) -> Iterator[T]:
+        try:
+            while True:
+                try:
+                    yield self._run(agen.__anext__())
+                except StopAsyncIteration:
+                    return
+        finally:
+            # 소비자가 중간에 멈춘 경우 스트림과 커넥션 정리
+            self._run(agen.aclose())
+
+    def upload_image(self, image_file: ImageSource, body_part: str, filename: str = 'image.jpg',
+                     content_type: Optional[str] = None) -> Dict[str, Any]:
+        return self._run(self.service.upload_image(image_file, body_part, filename, content_type))
+
+    def validate_image(self, diagnosis_id: str) -> Dict[str, Any]:
+        return self._run(self.service.validate_image(diagnosis_id))
+
+    def classify_image(self, diagnosis_id: str) -> Dict[str, Any]:
+        return self._run(self.service.classify_image(diagnosis_id))
+
+    def get_image_description(self, diagnosis_id: str) -> Dict[str, Any]:
+        return self._run(self.service.get_image_description(diagnosis_id))
+
+    def submit_symptoms(self, diagnosis_id: str, symptoms: list) -> Dict[str, Any]:
+        return self._run(self.service.submit_symptoms(diagnosis_id, symptoms))
+
+    def submit_other_symptoms(self, diagnosis_id: str, other_symptoms: str) -> Dict[str, Any]:
+        return self._run(self.service.submit_other_symptoms(diagnosis_id, other_symptoms))
+
+    def get_final_diagnosis(self, diagnosis_id: str, last_event_id: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        return self._iterate(self.service.get_final_diagnosis(diagnosis_id, last_event_id))
@@ -0,0 +1,277 @@
+"""여러 사진을 한 번에 진단하는 배치 모드
+
+CSV의 각 행(사진 경로, 부위, 증상)을 업로드 → 검증 → 분류/설명 → 증상 제출 → 최종 진단까지
+동시 실행 수와 백엔드별 초당 호출 수를 제한하며 처리하고, 끝나는 대로 JSONL 파일에 한 줄씩 기록한다.
+같은 출력 파일로 다시 실행하면 이미 성공한 id는 건너뛴다.
+
+CSV 열: id, image_path, body_part, symptoms(';'로 구분한 enum), other_symptoms
+
+    python -m services.batch photos.csv results.jsonl --concurrency 8 --rate springboot=5 --rate fastapi=10
+    python -m services.batch photos.csv results.jsonl --parquet results.parquet --summary
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+from services.catalog import BODY_PARTS, SYMPTOMS
+from services.diagnosis import analyze_image
+from services.image_preprocess import ImagePreprocessConfig, preprocess_image
+from services.sse import TextAccumulator
+
+# APIService 메서드별 호출 대상 백엔드 (속도 제한 적용용)
+OPERATION_BACKENDS = {
+    "upload_image": "springboot",
+    "validate_image": "fastapi",
+    "classify_image": "springboot",
+    "get_image_description": "fastapi",
+    "submit_symptoms": "springboot",
+    "submit_other_symptoms": "fastapi",
+    "get_final_diagnosis": "fastapi",
+}
+
+
+@dataclass
+class BatchItem:
+    """배치 입력 한 행"""
+    id: str
+    image_path: str
+    body_part: str
+    symptoms: List[str] = field(default_factory=list)
+    other_symptoms: str = ""
+
+
+def read_batch_csv(path: str) -> List[BatchItem]:
+    """배치 입력 CSV 읽기 (image_path가 상대 경로면 CSV 파일 위치 기준)"""
+    base_dir = os.path.dirname(os.path.abspath(path))
+    items = []
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        for row in csv.DictReader(f):
+            items.append(BatchItem(
+                id=row["id"].strip(),
+                image_path=os.path.join(base_dir, row["image_path"].strip()),
+                body_part=row["body_part"].strip(),
+                symptoms=[s.strip() for s in (row.get("symptoms") or "").split(";") if s.strip()],
+                other_symptoms=(row.get("other_symptoms") or "").strip(),
+            ))
+    return items
+
+
+def validate_item(item: BatchItem) -> Optional[str]:
+    """카탈로그에 없는 부위/증상이 있으면 오류 메시지"""
+    if item.body_part not in BODY_PARTS:
+        return f"알 수 없는 부위입니다: {item.body_part}"
+    unknown = [symptom for symptom in item.symptoms if symptom not in SYMPTOMS]
+    if unknown:
+        return f"알 수 없는 증상입니다: {', '.join(unknown)}"
+    if not item.symptoms:
+        return "최소 1개 이상의 증상이 필요합니다."
+    return None
+
+
+class TokenBucket:
+    """초당 rate개, 최대 burst개까지 몰아서 허용하는 토큰 버킷"""
+
+    def __init__(self, rate: float, burst: Optional[float] = None, clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.capacity = burst if burst is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._clock = clock
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """토큰 하나를 얻을 때까지 대기"""
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class RateLimitedAPI:
+    """APIService 호출 전에 백엔드별 토큰 버킷을 거치게 하는 래퍼"""
+
+    def __init__(self, api_service, limits: Dict[str, TokenBucket]):
+        self._api_service = api_service
+        self._limits = limits
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._api_service, name)
+        bucket = self._limits.get(OPERATION_BACKENDS.get(name, ""))
+        if bucket is None or not callable(attr):
+            return attr
+
+        def call(*args, **kwargs):
+            bucket.acquire()
+            return attr(*args, **kwargs)
+        return call
+
+
+def load_checkpoint(output_path: str) -> Set[str]:
+    """출력 파일에서 이미 끝난(오류가 아닌) id 목록 읽기"""
+    done: Set[str] = set()
+    if not os.path.exists(output_path):
+        return done
+    with open(output_path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # 중단되며 잘린 마지막 줄
+            if record.get("status") != "error":
+                done.add(record["id"])
+    return done
+
+
+class BatchRunner:
+    """APIService로 배치 입력을 동시에 진단하고 결과를 JSONL로 기록"""
+
+    def __init__(self, api_service, concurrency: int = 4, rate_limits: Optional[Dict[str, float]] = None,
+                 preprocess_config: Optional[ImagePreprocessConfig] = None):
+        limits = {backend: TokenBucket(rate) for backend, rate in (rate_limits or {}).items() if rate > 0}
+        self.api = RateLimitedAPI(api_service, limits) if limits else api_service
+        self.concurrency = concurrency
+        self.preprocess_config = preprocess_config or ImagePreprocessConfig.from_env()
+
+    def diagnose(self, item: BatchItem) -> Dict[str, Any]:
+        """한 건을 끝까지 진단하고 결과 레코드 반환 (실패해도 예외 대신 status=error)"""
+        start = time.perf_counter()
+        record: Dict[str, Any] = {"id": item.id, "image_path": item.image_path, "body_part": item.body_part}
+        try:
+            error = validate_item(item)
+            if error:
+                raise ValueError(error)
+
+            with open(item.image_path, "rb") as f:
+                image = preprocess_image(f, self.preprocess_config)
+            result = analyze_image(self.api, image, item.body_part)
+            diagnosis_id = result["diagnosisId"]
+            record.update(diagnosisId=diagnosis_id, validation=result["validation"])
+            if not result["validation"].get("is_skin_related"):
+                record["status"] = "not_skin"
+                return record
+            record.update(classification=result.get("classification"), description=result.get("description"))
+
+            self.api.submit_symptoms(diagnosis_id, item.symptoms)
+            if item.other_symptoms:
+                self.api.submit_other_symptoms(diagnosis_id, item.other_symptoms)
+
+            diagnosis = TextAccumulator()
+            for chunk in self.api.get_final_diagnosis(diagnosis_id):
+                if "chunk" in chunk:
+                    diagnosis.append(chunk["chunk"])
+            record.update(status="ok", diagnosis=diagnosis.getvalue())
+        except Exception as e:
+            record.update(status="error", error=f"{type(e).__name__}: {e}")
+        finally:
+            record["elapsed_s"] = round(time.perf_counter() - start, 3)
+        return record
+
+    def run(self, items: Iterable[BatchItem], output_path: str, resume: bool = True,
+            on_result: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, int]:
+        """배치 실행 (resume이면 출력 파일에 이미 있는 id는 건너뜀), 상태별 건수 반환
+
+        skipped는 이번 입력 중 건너뛴 건수이며, 출력 파일에만 있는 id는 세지 않는다.
+        """
+        done = load_checkpoint(output_path) if resume else set()
+        items = list(items)
+        pending = [item for item in items if item.id not in done]
+        counts = {"skipped": len(items) - len(pending), "ok": 0, "not_skin": 0, "error": 0}
+        lock = threading.Lock()
+
+        with open(output_path, "a" if resume else "w", encoding="utf-8") as out:
+            def run_one(item: BatchItem):
+                record = self.diagnose(item)
+                line = json.dumps(record, ensure_ascii=False) + "\n"
+                with lock:
+                    # 한 줄씩 바로 기록하므로 중단되어도 여기까지의 결과가 체크포인트가 됨
+                    out.write(line)
+                    out.flush()
+                    counts[record["status"]] += 1
+                if on_result is not None:
+                    on_result(record)
+
+            with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="batch") as executor:
+                list(executor.map(run_one, pending))
+        return counts
+
+
+def load_results(jsonl_path: str):
+    """JSONL 결과를 DataFrame으로 읽기 (다시 실행한 id는 마지막 결과만 사용)"""
+    import pandas as pd
+
+    frame = pd.read_json(jsonl_path, lines=True, dtype={"id": str})
+    return frame.drop_duplicates("id", keep="last").reset_index(drop=True)
+
+
+def write_parquet(jsonl_path: str, parquet_path: str):
+    """JSONL 결과를 Parquet로 변환 (pandas와 pyarrow 필요)"""
+    frame = load_results(jsonl_path)
+    # 중첩된 응답은 문자열로 저장
+    for column in ("validation", "classification", "description"):
+        if column in frame:
+            frame[column] = frame[column].map(
+                lambda value: None if value is None or value != value else json.dumps(value, ensure_ascii=False))
+    frame.to_parquet(parquet_path, index=False)
+
+
+def summarize(jsonl_path: str):
+    """상태별 건수와 소요 시간 요약 (pandas DataFrame)"""
+    return load_results(jsonl_path).groupby("status")["elapsed_s"].describe(percentiles=[0.5, 0.95])
+
+
+def _parse_rate(value: str) -> Dict[str, float]:
+    backend, _, rate = value.partition("=")
+    if backend not in ("springboot", "fastapi") or not rate:
+        raise argparse.ArgumentTypeError("--rate는 springboot=N 또는 fastapi=N 형식입니다.")
+    return {backend: float(rate)}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("input", help="배치 입력 CSV")
+    parser.add_argument("output", help="결과 JSONL (체크포인트로도 사용)")
+    parser.add_argument("--concurrency", type=int, default=4, help="동시에 진단할 건수")
+    parser.add_argument("--rate", type=_parse_rate, action="append", default=[],
+                        help="백엔드별 초당 최대 호출 수 (예: springboot=5)")
+    parser.add_argument("--no-resume", action="store_true", help="출력 파일을 덮어쓰고 처음부터 실행")
+    parser.add_argument("--parquet", help="끝난 뒤 결과를 Parquet 파일로도 저장")
+    parser.add_argument("--summary", action="store_true", help="끝난 뒤 상태별 요약 출력 (pandas)")
+    args = parser.parse_args(argv)
+
+    from services.api_service import APIService
+
+    rate_limits: Dict[str, float] = {}
+    for rate in args.rate:
+        rate_limits.update(rate)
+    items = read_batch_csv(args.input)
+    runner = BatchRunner(APIService(), concurrency=args.concurrency, rate_limits=rate_limits)
+
+    def report(record: Dict[str, Any]):
+        message = record.get("error") or record.get("diagnosisId")
+        print(f"[{record['status']}] {record['id']} {message} ({record['elapsed_s']}s)", flush=True)
+
+    counts = runner.run(items, args.output, resume=not args.no_resume, on_result=report)
+    print(" ".join(f"{status}={count}" for status, count in counts.items()))
+
+    if args.parquet:
+        write_parquet(args.output, args.parquet)
+    if args.summary:
+        print(summarize(args.output))
+    return 0 if counts["error"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,74 @@
+import json
+import os
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, Mapping, Tuple
+
+# 백엔드 enum 목록과 동기화하는 기본 카탈로그 파일 (CATALOG_PATH로 교체 가능)
+DEFAULT_CATALOG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "catalog.json")
+
+Item = Tuple[str, str]  # (표시 이름, enum)
+
+
+class Catalog:
+    """카테고리별로 묶인 (표시 이름, enum) 목록과 조회용 인덱스 (불변)"""
+
+    __slots__ = ("categories", "items", "enums", "label_by_enum", "enum_by_label", "index_by_enum")
+
+    def __init__(self, categories: Iterable[Tuple[str, Iterable[Item]]]):
+        categories = tuple((name, tuple((label, enum) for label, enum in items)) for name, items in categories)
+        items = tuple(item for _, category_items in categories for item in category_items)
+        label_by_enum: Dict[str, str] = {}
+        enum_by_label: Dict[str, str] = {}
+        for label, enum in items:
+            if enum in label_by_enum:
+                raise ValueError(f"중복된 enum입니다: {enum}")
+            label_by_enum[enum] = label
+            enum_by_label[label] = enum
+
+        object.__setattr__(self, "categories", categories)
+        object.__setattr__(self, "items", items)
+        object.__setattr__(self, "enums", tuple(enum for _, enum in items))
+        object.__setattr__(self, "label_by_enum", MappingProxyType(label_by_enum))
+        object.__setattr__(self, "enum_by_label", MappingProxyType(enum_by_label))
+        object.__setattr__(self, "index_by_enum", MappingProxyType({enum: i for i, (_, enum) in enumerate(items)}))
+
+    def __setattr__(self, name: str, value: Any):
+        raise AttributeError("Catalog는 변경할 수 없습니다.")
+
+    @property
+    def category_names(self) -> Tuple[str, ...]:
+        return tuple(name for name, _ in self.categories)
+
+    def label(self, enum: str, default: str = "") -> str:
+        """enum에 해당하는 표시 이름"""
+        return self.label_by_enum.get(enum, default)
+
+    def index(self, enum: str) -> int:
+        """카탈로그 전체에서 enum의 순서 (비트셋 위치로 사용)"""
+        return self.index_by_enum[enum]
+
+    def __contains__(self, enum: str) -> bool:
+        return enum in self.label_by_enum
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+
+def _parse_catalog(entries: Iterable[Mapping[str, Any]]) -> Catalog:
+    return Catalog((entry["category"], [tuple(item) for item in entry["items"]]) for entry in entries)
+
+
+def load_catalogs(path: str = DEFAULT_CATALOG_PATH) -> Tuple[Catalog, Catalog]:
+    """JSON 또는 YAML 파일에서 (부위 카탈로그, 증상 카탈로그) 읽기"""
+    with open(path, encoding="utf-8") as f:
+        if path.endswith((".yaml", ".yml")):
+            import yaml  # 선택 의존성: YAML 카탈로그를 쓸 때만 필요
+            data = yaml.safe_load(f)
+        else:
+            data = json.load(f)
+    return _parse_catalog(data["body_parts"]), _parse_catalog(data["symptoms"])
+
+
+# import 시 한 번만 로드
+# import 시점에 읽으므로 .env를 불러오지 않도록 os.environ을 직접 조회 (.env의 CATALOG_PATH는 적용되지 않음)
+BODY_PARTS, SYMPTOMS = load_catalogs(os.environ.get("CATALOG_PATH", DEFAULT_CATALOG_PATH))
@@ -0,0 +1,228 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, List, Optional
+
+from services.config import getenv
+
+
+class ChunkLog:
+    """진단 하나의 최종 진단 스트림 청크 로그 (추가만 가능)
+
+    마지막으로 받은 SSE 이벤트 id를 함께 보관해 끊긴 스트림을 Last-Event-ID로 이어받는다.
+    path가 있으면 청크를 받을 때마다 JSON Lines 파일에 덧붙인다.
+    저장소에서 삭제(discard)된 로그는 더 이상 기록하지 않으므로, 취소된 작업이 들고 있던
+    로그에 청크를 덧붙여도 삭제한 파일이 다시 생기지 않는다.
+    """
+
+    def __init__(self, diagnosis_id: str, path: Optional[str] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        self.diagnosis_id = diagnosis_id
+        self.path = path
+        self.last_event_id: Optional[str] = None
+        self.complete = False
+        self.nbytes = 0
+        self._texts: List[str] = []
+        self._file = None
+        self._discarded = False
+        self._clock = clock
+        self.updated_at = clock()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, diagnosis_id: str, path: str, clock: Callable[[], float] = time.monotonic) -> "ChunkLog":
+        """디스크에 기록된 로그 읽기 (마지막 줄이 잘렸으면 그 앞까지만 사용)"""
+        log = cls(diagnosis_id, path, clock)
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    break
+                if entry.get("done"):
+                    log.complete = True
+                    break
+                log._texts.append(entry["text"])
+                log.nbytes += len(entry["text"])
+                if entry.get("id") is not None:
+                    log.last_event_id = entry["id"]
+        return log
+
+    def _write(self, entry: dict):
+        if self.path is None or self._discarded:
+            return
+        if self._file is None:
+            self._file = open(self.path, "a", encoding="utf-8")
+        self._file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self._file.flush()
+
+    def append(self, text: str, event_id: Optional[str] = None):
+        with self._lock:
+            if self._discarded:
+                return
+            self.updated_at = self._clock()
+            self._texts.append(text)
+            self.nbytes += len(text)
+            if event_id is not None:
+                self.last_event_id = event_id
+            self._write({"id": event_id, "text": text})
+
+    def mark_complete(self):
+        """스트림을 끝까지 받았음을 기록"""
+        with self._lock:
+            if self._discarded:
+                return
+            self.complete = True
+            self._write({"done": True})
+            self._close()
+
+    def reset(self):
+        """이어받을 수 없는 로그를 비우고 처음부터 다시 받을 준비"""
+        with self._lock:
+            self._clear()
+
+    def discard(self):
+        """로그를 비우고 파일을 삭제한 뒤 이후의 기록을 모두 무시 (저장소에서 삭제할 때 사용)"""
+        with self._lock:
+            self._discarded = True
+            self._clear()
+
+    def _clear(self):
+        self._close()
+        self._texts = []
+        self.nbytes = 0
+        self.last_event_id = None
+        self.complete = False
+        if self.path is not None and os.path.exists(self.path):
+            os.remove(self.path)
+
+    def chunks(self, offset: int = 0) -> List[str]:
+        with self._lock:
+            return self._texts[offset:]
+
+    def text(self) -> str:
+        with self._lock:
+            return "".join(self._texts)
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
+    @property
+    def resumable(self) -> bool:
+        return self.complete or not self._texts or self.last_event_id is not None
+
+    def close(self):
+        """파일 핸들 닫기 (이후에 기록하면 파일을 다시 열어 덧붙임)"""
+        with self._lock:
+            self._close()
+
+    def _close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class ChunkLogStore:
+    """diagnosis_id별 청크 로그 저장소
+
+    메모리 사용량이 max_bytes를 넘으면 완료된 로그부터 오래된 순으로 메모리에서 내리고,
+    그래도 넘으면 stale_seconds 동안 청크가 오지 않은 미완료 로그(실패하거나 버려진 스트림)도 내린다.
+    spill_dir이 있으면 모든 로그가 디스크에도 기록되므로 내린 로그는 다음 조회 때 다시 읽는다.
+    """
+
+    def __init__(self, max_bytes: int = 8 * 1024 * 1024, spill_dir: Optional[str] = None,
+                 stale_seconds: float = 300.0, clock: Callable[[], float] = time.monotonic):
+        self.max_bytes = max_bytes
+        self.spill_dir = spill_dir
+        self.stale_seconds = stale_seconds
+        self._clock = clock
+        self._logs: "OrderedDict[str, ChunkLog]" = OrderedDict()
+        self._lock = threading.Lock()
+        if spill_dir:
+            os.makedirs(spill_dir, exist_ok=True)
+
+    @classmethod
+    def from_env(cls) -> "ChunkLogStore":
+        """환경 변수에서 로그 저장소 설정 읽기"""
+        return cls(
+            max_bytes=int(getenv("CHUNK_LOG_MAX_BYTES", str(8 * 1024 * 1024))),
+            spill_dir=getenv("CHUNK_LOG_DIR") or None,
+            stale_seconds=float(getenv("CHUNK_LOG_STALE_SECONDS", "300")),
+        )
+
+    def _path(self, diagnosis_id: str) -> Optional[str]:
+        if not self.spill_dir:
+            return None
+        name = hashlib.sha256(diagnosis_id.encode("utf-8")).hexdigest()[:32]
+        return os.path.join(self.spill_dir, f"{name}.jsonl")
+
+    def _evict(self, keep: Optional[str] = None):
+        total = sum(log.nbytes for log in self._logs.values())
+        # 받는 중인 로그는 내리면 작업과 화면이 서로 다른 로그를 보게 되므로 오래 멈춘 것만 내림
+        stale_before = self._clock() - self.stale_seconds
+        for evictable in (lambda log: log.complete, lambda log: log.updated_at <= stale_before):
+            for diagnosis_id in list(self._logs):
+                if total <= self.max_bytes:
+                    return
+                log = self._logs[diagnosis_id]
+                if diagnosis_id != keep and evictable(log):
+                    del self._logs[diagnosis_id]
+                    log.close()
+                    total -= log.nbytes
+
+    def get(self, diagnosis_id: str) -> Optional[ChunkLog]:
+        """메모리 또는 디스크에 있는 로그 (없으면 None)"""
+        with self._lock:
+            # 청크는 로그에 직접 덧붙으므로 메모리 상한은 조회할 때마다 확인
+            self._evict(keep=diagnosis_id)
+            log = self._logs.get(diagnosis_id)
+            if log is not None:
+                self._logs.move_to_end(diagnosis_id)
+                return log
+            path = self._path(diagnosis_id)
+            if path is None or not os.path.exists(path):
+                return None
+            log = ChunkLog.load(diagnosis_id, path, self._clock)
+            self._logs[diagnosis_id] = log
+            self._evict(keep=diagnosis_id)
+            return log
+
+    def open(self, diagnosis_id: str) -> ChunkLog:
+        """로그를 가져오거나 새로 생성"""
+        log = self.get(diagnosis_id)
+        if log is not None:
+            return log
+        with self._lock:
+            log = self._logs.get(diagnosis_id)
+            if log is None:
+                log = ChunkLog(diagnosis_id, self._path(diagnosis_id), self._clock)
+                self._logs[diagnosis_id] = log
+                self._evict(keep=diagnosis_id)
+            return log
+
+    def discard(self, diagnosis_id: str):
+        """로그를 메모리와 디스크에서 삭제 (이 로그를 들고 있는 작업이 더 기록해도 무시됨)"""
+        with self._lock:
+            log = self._logs.pop(diagnosis_id, None)
+        if log is not None:
+            log.discard()
+        else:
+            path = self._path(diagnosis_id)
+            if path is not None and os.path.exists(path):
+                os.remove(path)
+
+
+_store: Optional[ChunkLogStore] = None
+_store_lock = threading.Lock()
+
+
+def get_chunk_log_store() -> ChunkLogStore:
+    """프로세스 전체에서 공유되는 청크 로그 저장소 반환"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = ChunkLogStore.from_env()
+        return _store
@@ -0,0 +1,24 @@
+import os
+import threading
+from typing import Optional
+
+_env_loaded = False
+_env_lock = threading.Lock()
+
+
+def load_env():
+    """.env 파일을 처음 한 번만 읽어 환경 변수에 반영 (이미 설정된 값은 덮어쓰지 않음)"""
+    global _env_loaded
+    if _env_loaded:
+        return
+    with _env_lock:
+        if not _env_loaded:
+            from dotenv import load_dotenv
+            load_dotenv()
+            _env_loaded = True
+
+
+def getenv(name: str, default: Optional[str] = None) -> Optional[str]:
+    """os.getenv와 같지만 처음 호출할 때 .env를 읽음 (import 시점에는 읽지 않음)"""
+    load_env()
+    return os.getenv(name, default)
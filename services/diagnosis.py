@@ -0,0 +1,101 @@
+import sys
+from contextlib import closing
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple, Type
+
+from services.chunk_log import ChunkLog
+from services.image_preprocess import PreprocessedImage
+from services.pipeline import run_concurrently
+from services.result_cache import ResultCache, image_cache_key
+
+
+def analyze_image(api_service, image: PreprocessedImage, body_part: str,
+                  cache: Optional[ResultCache] = None,
+                  on_progress: Optional[Callable[[str], None]] = None,
+                  session_id: Optional[str] = None) -> Dict[str, Any]:
+    """1단계 파이프라인: 업로드 → 검증 → 분류/설명 (동시 실행)
+
+    반환값에는 diagnosisId, validation, classification, description과
+    캐시 적중 여부(cached)가 들어 있다. 피부 관련 이미지가 아니면
+    classification/description 없이 반환한다. on_progress는 각 단계를 시작할 때
+    단계 설명과 함께 호출된다.
+
+    diagnosisId에는 이후 제출한 증상과 최종 진단 스트림이 묶이므로 캐시는 session_id별로 나눈다.
+    다른 세션이 같은 사진을 올려도 캐시된 diagnosisId를 받지 않고 새로 업로드한다.
+    """
+    report = on_progress or (lambda stage: None)
+    key = image_cache_key(image.data, body_part, session_id)
+    if cache is not None:
+        cached = cache.get(key)
+        if cached is not None:
+            return dict(cached, cached=True)
+
+    report("사진을 업로드하고 있습니다...")
+    response = api_service.upload_image(
+        image.data, body_part, filename=image.filename, content_type=image.content_type
+    )
+    diagnosis_id = response.get('diagnosisId')
+    result: Dict[str, Any] = {"diagnosisId": diagnosis_id}
+
+    report("피부 사진인지 확인하고 있습니다...")
+    result["validation"] = api_service.validate_image(diagnosis_id)
+    if result["validation"].get('is_skin_related'):
+        report("피부 상태를 분석하고 있습니다...")
+        # 분류와 상태 설명은 서로 다른 백엔드이므로 동시에 호출
+        result.update(run_concurrently({
+            "classification": lambda: api_service.classify_image(diagnosis_id),
+            "description": lambda: api_service.get_image_description(diagnosis_id),
+        }))
+
+    if cache is not None:
+        cache.set(key, result)
+    return dict(result, cached=False)
+
+
+def _resumable_errors() -> Tuple[Type[BaseException], ...]:
+    """스트림이 중간에 끊겼을 때 Last-Event-ID로 이어받을 오류 (연결 끊김과 타임아웃만)
+
+    requests의 HTTPError나 JSONDecodeError도 OSError의 하위 클래스이므로 OSError 전체를
+    잡지 않는다. HTTP 클라이언트는 사용하는 쪽만 import되어 있으므로 이미 로드된 경우에만 포함한다.
+    """
+    errors: Tuple[Type[BaseException], ...] = (ConnectionError,)
+    requests = sys.modules.get("requests")
+    if requests is not None:
+        errors += (requests.ConnectionError, requests.exceptions.ChunkedEncodingError, requests.Timeout)
+    httpx = sys.modules.get("httpx")
+    if httpx is not None:
+        errors += (httpx.TransportError,)
+    return errors
+
+
+def stream_final_diagnosis(api_service, diagnosis_id: str, log: ChunkLog, max_resumes: int = 2,
+                           check_cancelled: Optional[Callable[[], None]] = None) -> Iterator[str]:
+    """최종 진단 텍스트 청크를 로그에 기록하며 반환
+
+    로그에 이미 있는 청크를 먼저 재생하고, 완료된 로그면 백엔드를 호출하지 않는다.
+    끊긴 스트림은 마지막 이벤트 id부터 이어받으며, 백엔드가 이벤트 id를 보내지 않아
+    이어받을 수 없는 로그는 비우고 처음부터 다시 받는다.
+    check_cancelled는 청크를 로그에 기록하기 전마다 호출되므로 취소된 작업은 기록하지 않고 멈춘다.
+    """
+    if not log.resumable:
+        log.reset()
+    yield from log.chunks()
+    if log.complete:
+        return
+
+    resumes = 0
+    while True:
+        try:
+            with closing(api_service.get_final_diagnosis(diagnosis_id, last_event_id=log.last_event_id)) as stream:
+                for chunk in stream:
+                    if 'chunk' in chunk:
+                        if check_cancelled is not None:
+                            check_cancelled()
+                        log.append(chunk['chunk'], chunk.get('id'))
+                        yield chunk['chunk']
+        except _resumable_errors():
+            if log.last_event_id is None or resumes >= max_resumes:
+                raise
+            resumes += 1
+            continue
+        log.mark_complete()
+        return
@@ -0,0 +1,226 @@
+import socket
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Any, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import NewConnectionError
+from urllib3.util.retry import Retry
+
+from services.config import getenv
+from services.instrumentation import add_connect_time
+
+# 멱등 호출에서 재시도할 HTTP 상태 코드
+RETRY_STATUS_CODES = (502, 503, 504)
+
+
+def is_retryable_error(error: BaseException) -> bool:
+    """멱등 호출을 다시 시도할 오류 (5xx 응답, 요청을 보낸 뒤 끊긴 연결)
+
+    연결 실패는 어댑터가 이미 재시도했고, 타임아웃은 다시 시도해도 같은 시간을 더 기다리게 되므로 제외한다.
+    """
+    if isinstance(error, requests.HTTPError):
+        return getattr(error.response, "status_code", None) in RETRY_STATUS_CODES
+    if isinstance(error, (requests.Timeout, requests.exceptions.SSLError)):
+        return False
+    if not isinstance(error, requests.ConnectionError):
+        return False
+    reason = getattr(error.args[0], "reason", None) if error.args else None
+    return not isinstance(reason, NewConnectionError)
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+@dataclass(frozen=True)
+class PoolConfig:
+    """백엔드별 커넥션 풀 설정"""
+    pool_maxsize: int = 10
+    pool_block: bool = False
+    keepalive: bool = True
+    connect_timeout: float = 3.05
+    read_timeout: float = 60.0
+    max_retries: int = 2
+    retry_backoff: float = 0.3
+
+    @classmethod
+    def from_env(cls) -> "PoolConfig":
+        """환경 변수에서 풀 설정 읽기"""
+        return cls(
+            pool_maxsize=int(getenv("API_POOL_MAXSIZE", cls.pool_maxsize)),
+            pool_block=_env_bool("API_POOL_BLOCK", cls.pool_block),
+            keepalive=_env_bool("API_TCP_KEEPALIVE", cls.keepalive),
+            connect_timeout=float(getenv("API_CONNECT_TIMEOUT", cls.connect_timeout)),
+            read_timeout=float(getenv("API_READ_TIMEOUT", cls.read_timeout)),
+            max_retries=int(getenv("API_MAX_RETRIES", cls.max_retries)),
+            retry_backoff=float(getenv("API_RETRY_BACKOFF", cls.retry_backoff)),
+        )
+
+    @property
+    def timeout(self) -> Tuple[float, float]:
+        return (self.connect_timeout, self.read_timeout)
+
+
+class PoolStats:
+    """커넥션 풀 사용 통계 (스레드 안전)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.reused = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+        self.retries = 0
+
+    def record_checkout(self, wait_time: float, reused: bool):
+        with self._lock:
+            self.checkouts += 1
+            if reused:
+                self.reused += 1
+            self.wait_time_total += wait_time
+            if wait_time > self.wait_time_max:
+                self.wait_time_max = wait_time
+
+    def record_retry(self):
+        with self._lock:
+            self.retries += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """현재 통계 반환"""
+        with self._lock:
+            checkouts = self.checkouts
+            return {
+                "checkouts": checkouts,
+                "reused": self.reused,
+                "new_connections": checkouts - self.reused,
+                "reuse_ratio": self.reused / checkouts if checkouts else 0.0,
+                "wait_time_total": self.wait_time_total,
+                "wait_time_avg": self.wait_time_total / checkouts if checkouts else 0.0,
+                "wait_time_max": self.wait_time_max,
+                "retries": self.retries,
+            }
+
+
+class _TimedConnectMixin:
+    """TCP/TLS 연결 시간을 현재 호출의 측정값에 더하는 커넥션"""
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            super().connect()
+        finally:
+            add_connect_time(time.perf_counter() - start)
+
+
+class _TimedHTTPConnection(_TimedConnectMixin, HTTPConnection):
+    pass
+
+
+class _TimedHTTPSConnection(_TimedConnectMixin, HTTPSConnection):
+    pass
+
+
+def _stats_pool_classes(stats: PoolStats) -> Dict[str, type]:
+    """커넥션 획득 시간과 재사용 여부를 기록하는 풀 클래스 생성"""
+
+    class _StatsMixin:
+        def _get_conn(self, timeout=None):
+            start = time.perf_counter()
+            conn = super()._get_conn(timeout)
+            # 이미 연결된 소켓이 남아 있으면 keep-alive 재사용
+            stats.record_checkout(time.perf_counter() - start, getattr(conn, "sock", None) is not None)
+            return conn
+
+    class _HTTPPool(_StatsMixin, HTTPConnectionPool):
+        ConnectionCls = _TimedHTTPConnection
+
+    class _HTTPSPool(_StatsMixin, HTTPSConnectionPool):
+        ConnectionCls = _TimedHTTPSConnection
+
+    return {"http": _HTTPPool, "https": _HTTPSPool}
+
+
+class PooledHTTPAdapter(HTTPAdapter):
+    """기본 타임아웃과 통계 수집을 지원하는 HTTPAdapter"""
+
+    def __init__(self, config: PoolConfig, stats: PoolStats):
+        self.pool_config = config
+        self.stats = stats
+        # 연결 실패는 요청이 전송되기 전이므로 모든 메서드에서 재시도 (연결 실패를 재시도하는 유일한 곳)
+        retries = Retry(
+            total=config.max_retries,
+            connect=config.max_retries,
+            read=0,
+            status=0,
+            other=0,
+            backoff_factor=config.retry_backoff,
+            raise_on_status=False,
+        )
+        super().__init__(
+            pool_connections=1,
+            pool_maxsize=config.pool_maxsize,
+            pool_block=config.pool_block,
+            max_retries=retries,
+        )
+
+    def init_poolmanager(self, connections, maxsize, block=False, **pool_kwargs):
+        if self.pool_config.keepalive:
+            pool_kwargs["socket_options"] = HTTPConnection.default_socket_options + [
+                (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+            ]
+        super().init_poolmanager(connections, maxsize, block=block, **pool_kwargs)
+        self.poolmanager.pool_classes_by_scheme = _stats_pool_classes(self.stats)
+
+    def send(self, request, timeout=None, **kwargs):
+        if timeout is None:
+            timeout = self.pool_config.timeout
+        return super().send(request, timeout=timeout, **kwargs)
+
+
+class PooledSession:
+    """백엔드 하나에 대한 공유 keep-alive 세션"""
+
+    def __init__(self, base_url: str, config: PoolConfig):
+        self.base_url = base_url.rstrip("/")
+        self.config = config
+        self.stats = PoolStats()
+        self._session = requests.Session()
+        adapter = PooledHTTPAdapter(config, self.stats)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+
+    def post(self, path: str, **kwargs) -> requests.Response:
+        """POST 요청 한 번 (연결 실패만 어댑터에서 재시도, 호출 단위 재시도는 호출하는 쪽에서 시도마다 보호)"""
+        return self._session.post(f"{self.base_url}{path}", **kwargs)
+
+    def retry_delay(self, attempt: int) -> float:
+        """attempt번째 재시도 전에 기다릴 시간 (지수 백오프)"""
+        self.stats.record_retry()
+        return self.config.retry_backoff * (2 ** attempt)
+
+    def close(self):
+        self._session.close()
+
+
+_sessions: Dict[Tuple[str, PoolConfig], PooledSession] = {}
+_sessions_lock = threading.Lock()
+
+
+def get_pooled_session(base_url: str, config: Optional[PoolConfig] = None) -> PooledSession:
+    """프로세스 전체에서 공유되는 백엔드별 세션 반환"""
+    config = config or PoolConfig.from_env()
+    key = (base_url.rstrip("/"), config)
+    with _sessions_lock:
+        session = _sessions.get(key)
+        if session is None:
+            session = PooledSession(base_url, config)
+            _sessions[key] = session
+        return session
@@ -0,0 +1,100 @@
+import io
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import BinaryIO, Optional, Union
+
+from services.config import getenv
+from services.lazy import lazy_import
+from services.pipeline import get_executor
+
+# Pillow는 첫 전처리 때 import (첫 화면 렌더링에는 필요 없음)
+Image = lazy_import("PIL.Image")
+ImageOps = lazy_import("PIL.ImageOps")
+
+# 저장 형식별 Content-Type과 파일 확장자
+_FORMATS = {
+    "JPEG": ("image/jpeg", "jpg"),
+    "WEBP": ("image/webp", "webp"),
+}
+
+
+@dataclass(frozen=True)
+class ImagePreprocessConfig:
+    """업로드 전 이미지 전처리 설정"""
+    max_side: int = 1600
+    format: str = "JPEG"
+    quality: int = 85
+
+    @classmethod
+    def from_env(cls) -> "ImagePreprocessConfig":
+        """환경 변수에서 전처리 설정 읽기"""
+        image_format = getenv("IMAGE_FORMAT", cls.format).upper()
+        if image_format not in _FORMATS:
+            raise ValueError(f"지원하지 않는 IMAGE_FORMAT입니다: {image_format}")
+        return cls(
+            max_side=int(getenv("IMAGE_MAX_SIDE", cls.max_side)),
+            format=image_format,
+            quality=int(getenv("IMAGE_QUALITY", cls.quality)),
+        )
+
+
+@dataclass(frozen=True)
+class PreprocessedImage:
+    """전처리된 업로드용 이미지"""
+    data: bytes
+    content_type: str
+    filename: str
+    width: int
+    height: int
+    original_size: int
+
+
+def preprocess_image(image_bytes: Union[bytes, BinaryIO],
+                     config: Optional[ImagePreprocessConfig] = None) -> PreprocessedImage:
+    """EXIF 방향 적용, 긴 변 기준 축소, 메타데이터 제거 후 재인코딩
+
+    image_bytes는 bytes 또는 업로드된 파일 객체이며, 파일 객체는 복사하지 않고 바로 읽는다.
+    """
+    config = config or ImagePreprocessConfig.from_env()
+    content_type, extension = _FORMATS[config.format]
+
+    if isinstance(image_bytes, (bytes, bytearray)):
+        source, original_size = io.BytesIO(image_bytes), len(image_bytes)
+    else:
+        source = image_bytes
+        original_size = source.seek(0, io.SEEK_END)
+        source.seek(0)
+
+    with Image.open(source) as image:
+        # JPEG는 디코딩 단계에서 바로 축소 (DCT 스케일링)
+        image.draft("RGB", (config.max_side, config.max_side))
+        image = ImageOps.exif_transpose(image)
+        if image.mode in ("RGBA", "LA") or (image.mode == "P" and "transparency" in image.info):
+            # 투명 배경은 흰색으로 합성
+            image = image.convert("RGBA")
+            background = Image.new("RGB", image.size, (255, 255, 255))
+            background.paste(image, mask=image.getchannel("A"))
+            image = background
+        elif image.mode != "RGB":
+            image = image.convert("RGB")
+        image.thumbnail((config.max_side, config.max_side), Image.LANCZOS)
+
+        # exif/icc 등을 넘기지 않으므로 메타데이터는 저장되지 않음
+        output = io.BytesIO()
+        image.save(output, format=config.format, quality=config.quality)
+        width, height = image.size
+
+    return PreprocessedImage(
+        data=output.getvalue(),
+        content_type=content_type,
+        filename=f"image.{extension}",
+        width=width,
+        height=height,
+        original_size=original_size,
+    )
+
+
+def submit_preprocess(image_bytes: Union[bytes, BinaryIO], config: Optional[ImagePreprocessConfig] = None) -> "Future[PreprocessedImage]":
+    """스크립트 스레드를 막지 않도록 파이프라인 스레드 풀에서 전처리 실행"""
+    config = config or ImagePreprocessConfig.from_env()
+    return get_executor().submit(preprocess_image, image_bytes, config)
@@ -0,0 +1,277 @@
+import atexit
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import asdict, dataclass
+from typing import Any, Deque, Dict, Iterable, List, Optional, Tuple
+
+from services.config import getenv
+
+_local = threading.local()
+
+
+def add_connect_time(seconds: float):
+    """현재 스레드에서 진행 중인 호출에 TCP/TLS 연결 시간 누적 (커넥션 클래스에서 호출)"""
+    _local.connect_time = getattr(_local, "connect_time", 0.0) + seconds
+
+
+def _reset_connect_time():
+    _local.connect_time = 0.0
+
+
+def _take_connect_time() -> float:
+    seconds = getattr(_local, "connect_time", 0.0)
+    _local.connect_time = 0.0
+    return seconds
+
+
+@dataclass
+class CallRecord:
+    """백엔드 호출 한 번의 측정 결과 (diagnosis_id가 상관관계 ID)"""
+    operation: str
+    backend: str
+    diagnosis_id: Optional[str]
+    started_at: float
+    connect_time: float = 0.0
+    ttfb: Optional[float] = None
+    total_time: float = 0.0
+    status: Optional[int] = None
+    error: Optional[str] = None
+    # 스트리밍 호출(get_final_diagnosis) 전용
+    first_chunk_time: Optional[float] = None
+    chunk_count: int = 0
+    bytes_received: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class Instrumentation:
+    """측정 결과를 받는 싱크의 기본 클래스 (기본 동작은 아무것도 하지 않음)"""
+
+    def record(self, record: CallRecord):
+        pass
+
+    def start(self, operation: str, backend: str, diagnosis_id: Optional[str] = None) -> "CallTimer":
+        return CallTimer(self, operation, backend, diagnosis_id)
+
+
+class CallTimer:
+    """호출 하나의 시간을 재고 끝나면 싱크로 CallRecord 전달"""
+
+    def __init__(self, sink: Instrumentation, operation: str, backend: str, diagnosis_id: Optional[str]):
+        self.sink = sink
+        self.operation = operation
+        self.backend = backend
+        self.diagnosis_id = diagnosis_id
+        self.status: Optional[int] = None
+        self.ttfb: Optional[float] = None
+        self.error: Optional[str] = None
+        self.first_chunk_time: Optional[float] = None
+        self.chunk_count = 0
+        self.bytes_received = 0
+        self._connect_time = 0.0
+        self._started_at = time.time()
+        self._start = time.perf_counter()
+        _reset_connect_time()
+
+    def observe_response(self, response):
+        """응답 헤더 수신 시점 기록 (requests의 elapsed는 요청 전송부터 헤더 파싱까지)"""
+        self.status = response.status_code
+        self.ttfb = response.elapsed.total_seconds()
+        self._connect_time += _take_connect_time()
+
+    def observe_chunk(self, nbytes: int):
+        """스트림에서 받은 원시 바이트 청크 기록"""
+        if self.first_chunk_time is None:
+            self.first_chunk_time = time.perf_counter() - self._start
+        self.chunk_count += 1
+        self.bytes_received += nbytes
+
+    def fail(self, error: BaseException):
+        self.error = f"{type(error).__name__}: {error}"
+
+    def finish(self):
+        self.sink.record(CallRecord(
+            operation=self.operation,
+            backend=self.backend,
+            diagnosis_id=self.diagnosis_id,
+            started_at=self._started_at,
+            connect_time=self._connect_time + _take_connect_time(),
+            ttfb=self.ttfb,
+            total_time=time.perf_counter() - self._start,
+            status=self.status,
+            error=self.error,
+            first_chunk_time=self.first_chunk_time,
+            chunk_count=self.chunk_count,
+            bytes_received=self.bytes_received,
+        ))
+
+    def __enter__(self) -> "CallTimer":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc is not None and not isinstance(exc, GeneratorExit):
+            self.fail(exc)
+        self.finish()
+        return False
+
+
+class InMemoryRecorder(Instrumentation):
+    """최근 측정 결과를 메모리에 보관 (사이드바 디버그 패널용)"""
+
+    def __init__(self, max_records: int = 1000):
+        self._records: Deque[CallRecord] = deque(maxlen=max_records)
+        self._lock = threading.Lock()
+
+    def record(self, record: CallRecord):
+        with self._lock:
+            self._records.append(record)
+
+    def records(self, diagnosis_ids: Optional[Iterable[str]] = None) -> List[CallRecord]:
+        """측정 결과 목록 (diagnosis_ids를 주면 해당 진단만)"""
+        with self._lock:
+            records = list(self._records)
+        if diagnosis_ids is None:
+            return records
+        wanted = set(diagnosis_ids)
+        return [record for record in records if record.diagnosis_id in wanted]
+
+
+class PrometheusFileExporter(Instrumentation):
+    """호출별 집계를 Prometheus 텍스트 형식 파일로 내보냄 (node_exporter textfile collector 등에서 수집)"""
+
+    BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+    def __init__(self, path: str, flush_interval: float = 1.0):
+        self.path = path
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._series: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._last_flush = 0.0
+        self._dirty = False
+        atexit.register(self.flush)
+
+    def record(self, record: CallRecord):
+        with self._lock:
+            series = self._series.setdefault((record.operation, record.backend), {
+                "count": 0, "errors": 0, "total_sum": 0.0, "buckets": [0] * len(self.BUCKETS),
+                "connect_sum": 0.0, "ttfb_sum": 0.0, "ttfb_count": 0,
+                "first_chunk_sum": 0.0, "first_chunk_count": 0, "chunks": 0, "bytes": 0,
+            })
+            series["count"] += 1
+            if record.error:
+                series["errors"] += 1
+            series["total_sum"] += record.total_time
+            for i, bound in enumerate(self.BUCKETS):
+                if record.total_time <= bound:
+                    series["buckets"][i] += 1
+            series["connect_sum"] += record.connect_time
+            if record.ttfb is not None:
+                series["ttfb_sum"] += record.ttfb
+                series["ttfb_count"] += 1
+            if record.first_chunk_time is not None:
+                series["first_chunk_sum"] += record.first_chunk_time
+                series["first_chunk_count"] += 1
+            series["chunks"] += record.chunk_count
+            series["bytes"] += record.bytes_received
+            self._dirty = True
+            due = time.monotonic() - self._last_flush >= self.flush_interval
+        if due:
+            self.flush()
+
+    def render(self) -> str:
+        """현재 집계를 Prometheus 텍스트 형식으로 변환"""
+        lines = [
+            "# HELP babycare_api_call_duration_seconds Total backend call time.",
+            "# TYPE babycare_api_call_duration_seconds histogram",
+        ]
+        other: Dict[str, List[str]] = {
+            "babycare_api_call_errors_total counter": [],
+            "babycare_api_call_connect_seconds_total counter": [],
+            "babycare_api_call_ttfb_seconds summary": [],
+            "babycare_api_stream_first_chunk_seconds summary": [],
+            "babycare_api_stream_chunks_total counter": [],
+            "babycare_api_stream_bytes_total counter": [],
+        }
+        with self._lock:
+            items = sorted((key, dict(series, buckets=list(series["buckets"])))
+                           for key, series in self._series.items())
+        for (operation, backend), series in items:
+            labels = f'operation="{operation}",backend="{backend}"'
+            for bound, count in zip(self.BUCKETS, series["buckets"]):
+                lines.append(f'babycare_api_call_duration_seconds_bucket{{{labels},le="{bound}"}} {count}')
+            lines.append(f'babycare_api_call_duration_seconds_bucket{{{labels},le="+Inf"}} {series["count"]}')
+            lines.append(f'babycare_api_call_duration_seconds_sum{{{labels}}} {series["total_sum"]}')
+            lines.append(f'babycare_api_call_duration_seconds_count{{{labels}}} {series["count"]}')
+            other["babycare_api_call_errors_total counter"].append(
+                f'babycare_api_call_errors_total{{{labels}}} {series["errors"]}')
+            other["babycare_api_call_connect_seconds_total counter"].append(
+                f'babycare_api_call_connect_seconds_total{{{labels}}} {series["connect_sum"]}')
+            other["babycare_api_call_ttfb_seconds summary"] += [
+                f'babycare_api_call_ttfb_seconds_sum{{{labels}}} {series["ttfb_sum"]}',
+                f'babycare_api_call_ttfb_seconds_count{{{labels}}} {series["ttfb_count"]}',
+            ]
+            if series["first_chunk_count"]:
+                other["babycare_api_stream_first_chunk_seconds summary"] += [
+                    f'babycare_api_stream_first_chunk_seconds_sum{{{labels}}} {series["first_chunk_sum"]}',
+                    f'babycare_api_stream_first_chunk_seconds_count{{{labels}}} {series["first_chunk_count"]}',
+                ]
+                other["babycare_api_stream_chunks_total counter"].append(
+                    f'babycare_api_stream_chunks_total{{{labels}}} {series["chunks"]}')
+                other["babycare_api_stream_bytes_total counter"].append(
+                    f'babycare_api_stream_bytes_total{{{labels}}} {series["bytes"]}')
+        for header, samples in other.items():
+            if samples:
+                name, metric_type = header.split()
+                lines.append(f"# TYPE {name} {metric_type}")
+                lines.extend(samples)
+        return "\n".join(lines) + "\n"
+
+    def flush(self):
+        """집계를 파일에 원자적으로 기록"""
+        with self._lock:
+            if not self._dirty:
+                return
+            self._dirty = False
+            self._last_flush = time.monotonic()
+        text = self.render()
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp_path, self.path)
+
+
+class CompositeInstrumentation(Instrumentation):
+    """여러 싱크로 같은 측정 결과 전달"""
+
+    def __init__(self, sinks: Iterable[Instrumentation]):
+        self.sinks = list(sinks)
+
+    def record(self, record: CallRecord):
+        for sink in self.sinks:
+            sink.record(record)
+
+
+_recorder = InMemoryRecorder()
+_instrumentation: Optional[Instrumentation] = None
+_instrumentation_lock = threading.Lock()
+
+
+def get_recorder() -> InMemoryRecorder:
+    """프로세스 전체에서 공유되는 메모리 기록기"""
+    return _recorder
+
+
+def get_instrumentation() -> Instrumentation:
+    """기본 측정 싱크 (메모리 기록 + METRICS_FILE이 있으면 Prometheus 텍스트 파일)"""
+    global _instrumentation
+    with _instrumentation_lock:
+        if _instrumentation is None:
+            sinks: List[Instrumentation] = [_recorder]
+            metrics_file = getenv("METRICS_FILE")
+            if metrics_file:
+                sinks.append(PrometheusFileExporter(metrics_file))
+            _instrumentation = CompositeInstrumentation(sinks)
+        return _instrumentation
@@ -0,0 +1,276 @@
+import queue
+import threading
+import time
+from enum import Enum
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from services.config import getenv
+
+
+class JobStatus(str, Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+FINISHED_STATUSES = (JobStatus.SUCCEEDED, JobStatus.FAILED, JobStatus.CANCELLED)
+
+DEFAULT_POOL = "default"
+
+
+class QueueFullError(Exception):
+    """작업 큐가 가득 차서 새 작업을 받을 수 없는 경우"""
+
+
+class JobCancelled(Exception):
+    """작업이 취소되어 실행을 중단하는 경우"""
+
+
+class Job:
+    """스케줄러에서 실행되는 작업 하나와 진행 상황
+
+    진행 이벤트는 작업이 실행되는 동안만 보관한다. 끝난 뒤에는 결과(result)만 남으므로
+    구독 중에 놓친 마지막 이벤트가 필요하면 작업이 따로 남긴 기록(예: 청크 로그)에서 읽는다.
+    """
+
+    def __init__(self, key: str, fn: Callable[["Job"], Any]):
+        self.key = key
+        self.fn = fn
+        self.status = JobStatus.PENDING
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self._events: List[Any] = []
+        self._cancel_requested = False
+        self._cond = threading.Condition()
+
+    @property
+    def done(self) -> bool:
+        return self.status in FINISHED_STATUSES
+
+    @property
+    def cancel_requested(self) -> bool:
+        return self._cancel_requested
+
+    def report(self, event: Any):
+        """진행 이벤트 추가 (작업 함수에서 호출)"""
+        with self._cond:
+            self._events.append(event)
+            self._cond.notify_all()
+
+    def check_cancelled(self):
+        """취소가 요청되었으면 JobCancelled 발생 (작업 함수에서 주기적으로 호출)"""
+        if self._cancel_requested:
+            raise JobCancelled(self.key)
+
+    def cancel(self):
+        """작업 취소 요청 (대기 중이면 바로 취소, 실행 중이면 다음 check_cancelled에서 중단)"""
+        with self._cond:
+            self._cancel_requested = True
+            if self.status == JobStatus.PENDING:
+                self._finish(JobStatus.CANCELLED)
+
+    def events_since(self, offset: int = 0, timeout: Optional[float] = None) -> List[Any]:
+        """offset 이후의 진행 이벤트 (없으면 새 이벤트나 완료까지 최대 timeout초 대기)"""
+        with self._cond:
+            if len(self._events) <= offset and not self.done and timeout:
+                self._cond.wait(timeout)
+            return self._events[offset:]
+
+    def iter_events(self, offset: int = 0, poll_interval: float = 0.5,
+                    on_idle: Optional[Callable[[], None]] = None) -> Iterator[Any]:
+        """작업이 끝날 때까지 진행 이벤트를 순서대로 반환 (구독, 끝나기 직전의 이벤트는 빠질 수 있음)
+
+        on_idle은 poll_interval 동안 새 이벤트가 없을 때마다 호출된다.
+        """
+        while True:
+            done = self.done
+            events = self.events_since(offset, timeout=poll_interval)
+            offset += len(events)
+            yield from events
+            if done and not events:
+                return
+            if not events and on_idle is not None:
+                on_idle()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """작업 완료까지 대기 (완료되었으면 True)"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while not self.done:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+            return True
+
+    def get_result(self, timeout: Optional[float] = None) -> Any:
+        """완료를 기다려 결과 반환 (실패/취소 시 예외 발생)"""
+        if not self.wait(timeout):
+            raise TimeoutError(f"{self.key} 작업이 {timeout}초 안에 끝나지 않았습니다.")
+        if self.status == JobStatus.CANCELLED:
+            raise JobCancelled(self.key)
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+    def _finish(self, status: JobStatus, result: Any = None, error: Optional[BaseException] = None):
+        self.status = status
+        self.result = result
+        self.error = error
+        self.finished_at = time.time()
+        # 보관 기간 동안 작업 함수가 붙잡고 있던 이미지나 스트리밍 청크 등을 놓아줌
+        self.fn = None
+        self._events = []
+        self._cond.notify_all()
+
+    def _run(self):
+        with self._cond:
+            if self.status != JobStatus.PENDING:
+                return
+            self.status = JobStatus.RUNNING
+            self.started_at = time.time()
+        try:
+            result = self.fn(self)
+        except JobCancelled:
+            with self._cond:
+                self._finish(JobStatus.CANCELLED)
+        except BaseException as e:
+            with self._cond:
+                self._finish(JobStatus.FAILED, error=e)
+        else:
+            with self._cond:
+                self._finish(JobStatus.SUCCEEDED, result=result)
+
+
+class JobScheduler:
+    """워커 풀과 크기 제한 큐를 가진 프로세스 내 작업 스케줄러
+
+    풀마다 큐와 워커가 따로 있어 오래 걸리는 작업(최종 진단 스트리밍)이 짧은 작업(1단계 분석)의
+    자리를 차지하지 않는다. 기본 풀의 워커 수는 max_workers, 나머지 풀은 pools로 정한다.
+
+    같은 키(예: diagnosis_id)로 대기 중이거나 실행 중인 작업이 있으면 새로 만들지 않고
+    그 작업을 돌려준다. 끝난 작업은 retain_seconds 동안 get으로만 조회할 수 있고, 같은 키로
+    다시 제출하면 새로 실행한다. 취소를 요청했지만 아직 실행 중인 작업에는 합류하지 않고, 새 작업은
+    그 작업이 끝난 뒤에 실행되므로 같은 키의 작업이 동시에 실행되지 않는다.
+    큐가 가득 차면 QueueFullError로 백엔드 동시 호출 수를 제한한다.
+    """
+
+    def __init__(self, max_workers: int = 8, max_queue: int = 32, retain_seconds: float = 600.0,
+                 pools: Optional[Dict[str, int]] = None):
+        self.max_workers = max_workers
+        self.retain_seconds = retain_seconds
+        self.pools = {DEFAULT_POOL: max_workers, **(pools or {})}
+        self._queues: "Dict[str, queue.Queue[Job]]" = {}
+        self._jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+        for name, workers in self.pools.items():
+            pool_queue = self._queues[name] = queue.Queue(maxsize=max_queue)
+            for i in range(workers):
+                threading.Thread(target=self._worker, args=(pool_queue,), name=f"job-{name}-{i}",
+                                 daemon=True).start()
+
+    @classmethod
+    def from_env(cls) -> "JobScheduler":
+        """환경 변수에서 스케줄러 설정 읽기"""
+        return cls(
+            max_workers=int(getenv("JOB_WORKERS", "8")),
+            max_queue=int(getenv("JOB_QUEUE_SIZE", "32")),
+            retain_seconds=float(getenv("JOB_RETAIN_SECONDS", "600")),
+            pools={"stream": int(getenv("JOB_STREAM_WORKERS", "8"))},
+        )
+
+    def _worker(self, pool_queue: "queue.Queue[Job]"):
+        while True:
+            job = pool_queue.get()
+            try:
+                job._run()
+            finally:
+                pool_queue.task_done()
+
+    def _purge(self):
+        now = time.time()
+        expired = [key for key, job in self._jobs.items()
+                   if job.done and now - job.finished_at > self.retain_seconds]
+        for key in expired:
+            del self._jobs[key]
+
+    def submit(self, key: str, fn: Callable[[Job], Any], pool: str = DEFAULT_POOL) -> Job:
+        """pool에 작업 제출 (같은 키의 대기 중/실행 중인 작업이 있으면 그 작업 반환)"""
+        with self._lock:
+            self._purge()
+            existing = self._jobs.get(key)
+            if existing is not None and not existing.done:
+                if not existing.cancel_requested:
+                    return existing
+                fn = _run_after(existing, fn)
+            job = Job(key, fn)
+            try:
+                self._queues[pool].put_nowait(job)
+            except queue.Full:
+                raise QueueFullError("진단 요청이 많아 잠시 후 다시 시도해주세요.")
+            self._jobs[key] = job
+            return job
+
+    def get(self, key: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(key)
+
+    def cancel(self, key: str) -> bool:
+        """키에 해당하는 작업 취소 요청"""
+        job = self.get(key)
+        if job is None or job.done:
+            return False
+        job.cancel()
+        return True
+
+    def forget(self, key: str):
+        """키에 해당하는 작업을 취소하고 끝난 작업은 목록에서 삭제
+
+        실행 중인 작업은 취소를 알아차리고 끝날 때까지 목록에 남아, 같은 키로 다시 제출한 작업이
+        그 뒤에 실행되게 한다.
+        """
+        with self._lock:
+            job = self._jobs.get(key)
+            if job is not None and job.done:
+                del self._jobs[key]
+        if job is not None and not job.done:
+            job.cancel()
+
+    def stats(self) -> Dict[str, int]:
+        """상태별 작업 수와 풀별 큐 길이 (queued는 전체 합계)"""
+        with self._lock:
+            counts = {status.value: 0 for status in JobStatus}
+            for job in self._jobs.values():
+                counts[job.status.value] += 1
+        for name, pool_queue in self._queues.items():
+            counts[f"queued_{name}"] = pool_queue.qsize()
+        counts["queued"] = sum(pool_queue.qsize() for pool_queue in self._queues.values())
+        return counts
+
+
+def _run_after(previous: Job, fn: Callable[[Job], Any]) -> Callable[[Job], Any]:
+    """previous가 끝날 때까지 기다렸다가 fn을 실행하는 작업 함수 (기다리는 동안에도 취소 가능)"""
+    def run(job: Job) -> Any:
+        while not previous.wait(0.1):
+            job.check_cancelled()
+        job.check_cancelled()
+        return fn(job)
+    return run
+
+
+_scheduler: Optional[JobScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_job_scheduler() -> JobScheduler:
+    """프로세스 전체에서 공유되는 작업 스케줄러 반환"""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = JobScheduler.from_env()
+        return _scheduler
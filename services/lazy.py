@@ -0,0 +1,34 @@
+import importlib
+from types import ModuleType
+from typing import Optional
+
+
+class LazyModule:
+    """속성에 처음 접근할 때 실제로 import하는 모듈 대리 객체"""
+
+    def __init__(self, name: str):
+        object.__setattr__(self, "_name", name)
+        object.__setattr__(self, "_module", None)
+
+    def _load(self) -> ModuleType:
+        module: Optional[ModuleType] = self._module
+        if module is None:
+            # import 잠금이 있어 여러 스레드에서 동시에 접근해도 한 번만 import됨
+            module = importlib.import_module(self._name)
+            object.__setattr__(self, "_module", module)
+        return module
+
+    def __getattr__(self, name: str):
+        return getattr(self._load(), name)
+
+    def __setattr__(self, name: str, value):
+        setattr(self._load(), name, value)
+
+    def __repr__(self) -> str:
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<lazy module {self._name!r} ({state})>"
+
+
+def lazy_import(name: str) -> LazyModule:
+    """무거운 모듈을 처음 사용할 때까지 import하지 않음 (예: Image = lazy_import("PIL.Image"))"""
+    return LazyModule(name)
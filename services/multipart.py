@@ -0,0 +1,152 @@
+import io
+import os
+import uuid
+from typing import AsyncIterator, BinaryIO, Dict, Iterator, List, Optional, Union
+
+ImageSource = Union[bytes, bytearray, memoryview, BinaryIO]
+
+# 본문을 읽을 때 한 번에 복사하는 최대 크기 (업로드 하나의 추가 메모리 상한)
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+# (시그니처 오프셋, 시그니처, Content-Type)
+_SIGNATURES = (
+    (0, b"\xff\xd8\xff", "image/jpeg"),
+    (0, b"\x89PNG\r\n\x1a\n", "image/png"),
+    (8, b"WEBP", "image/webp"),
+    (0, b"GIF8", "image/gif"),
+)
+SNIFF_BYTES = 16
+
+
+def sniff_content_type(head: bytes, default: str = "image/jpeg") -> str:
+    """파일 앞부분 바이트로 이미지 Content-Type 판별"""
+    for offset, signature, content_type in _SIGNATURES:
+        if head[offset:offset + len(signature)] == signature:
+            if content_type == "image/webp" and head[:4] != b"RIFF":
+                continue
+            return content_type
+    return default
+
+
+def _as_buffer(source: ImageSource) -> Optional[memoryview]:
+    """복사 없이 얻을 수 있으면 원본 버퍼의 memoryview (BytesIO/UploadedFile은 getbuffer 사용)"""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return memoryview(source).cast("B")
+    getbuffer = getattr(source, "getbuffer", None)
+    if getbuffer is not None:
+        return getbuffer()
+    return None
+
+
+class _FileSegment:
+    """getbuffer가 없는 파일 객체의 [start, start + length) 구간"""
+
+    def __init__(self, fileobj: BinaryIO):
+        self.fileobj = fileobj
+        self.start = fileobj.tell()
+        self.length = fileobj.seek(0, io.SEEK_END) - self.start
+        fileobj.seek(self.start)
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __getitem__(self, key: slice) -> bytes:
+        self.fileobj.seek(self.start + key.start)
+        return self.fileobj.read(key.stop - key.start)
+
+
+class MultipartEncoder:
+    """multipart/form-data 본문을 조각 단위로 만들어 내는 파일 객체
+
+    파일 부분은 원본 버퍼의 memoryview(또는 파일 객체)에서 요청받은 만큼만 복사하므로
+    본문 전체를 메모리에 만들지 않는다. requests에는 data로, httpx에는 content로 넘긴다.
+    seek/tell을 지원해 연결 재시도 시 처음부터 다시 보낼 수 있다.
+    """
+
+    def __init__(self, fields: Dict[str, str], file_field: str, source: ImageSource, filename: str,
+                 content_type: Optional[str] = None, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        self.chunk_size = chunk_size
+        self.boundary = uuid.uuid4().hex
+        self.content_type = f"multipart/form-data; boundary={self.boundary}"
+
+        body = _as_buffer(source)
+        if body is None:
+            body = _FileSegment(source)
+        if content_type is None:
+            content_type = sniff_content_type(bytes(body[0:SNIFF_BYTES]))
+        self.file_content_type = content_type
+
+        head = b"".join(
+            f'--{self.boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n'.encode("utf-8")
+            + value.encode("utf-8") + b"\r\n"
+            for name, value in fields.items()
+        )
+        head += (f'--{self.boundary}\r\nContent-Disposition: form-data; name="{file_field}"; '
+                 f'filename="{filename}"\r\nContent-Type: {content_type}\r\n\r\n').encode("utf-8")
+        tail = f"\r\n--{self.boundary}--\r\n".encode("utf-8")
+        self._segments: List[Union[memoryview, _FileSegment]] = [memoryview(head), body, memoryview(tail)]
+        self._length = sum(len(segment) for segment in self._segments)
+        self._position = 0
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        return {"Content-Type": self.content_type, "Content-Length": str(self._length)}
+
+    def __len__(self) -> int:
+        return self._length
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        if whence == os.SEEK_CUR:
+            offset += self._position
+        elif whence == os.SEEK_END:
+            offset += self._length
+        self._position = max(0, min(offset, self._length))
+        return self._position
+
+    def read(self, size: int = -1) -> bytes:
+        """현재 위치부터 최대 size 바이트 (size가 없으면 chunk_size 바이트)"""
+        if size is None or size < 0:
+            size = self.chunk_size
+        size = min(size, self.chunk_size, self._length - self._position)
+        parts = []
+        start = 0
+        for segment in self._segments:
+            end = start + len(segment)
+            if size > 0 and self._position < end:
+                offset = self._position - start
+                take = min(size, end - self._position)
+                parts.append(bytes(segment[offset:offset + take]))
+                self._position += take
+                size -= take
+            start = end
+        return b"".join(parts) if len(parts) != 1 else parts[0]
+
+    def __iter__(self) -> Iterator[bytes]:
+        self.seek(0)
+        while True:
+            chunk = self.read()
+            if not chunk:
+                return
+            yield chunk
+
+    async def aiter_chunks(self) -> AsyncIterator[bytes]:
+        """httpx.AsyncClient용 비동기 조각 반복자"""
+        for chunk in self:
+            yield chunk
+
+    def close(self):
+        """원본 버퍼의 memoryview 해제 (BytesIO는 export가 남아 있으면 크기를 바꿀 수 없음)"""
+        for segment in self._segments:
+            if isinstance(segment, memoryview):
+                segment.release()
+        self._segments = []
+
+    def __enter__(self) -> "MultipartEncoder":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
@@ -0,0 +1,62 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor, FIRST_EXCEPTION, wait
+from typing import Any, Callable, Dict, Optional
+
+from services.config import getenv
+
+# 진단 파이프라인에서 공유하는 스레드 풀 (처음 사용할 때 생성)
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+class PipelineError(Exception):
+    """동시 실행 단계에서 하나 이상의 호출이 실패한 경우"""
+
+    def __init__(self, errors: Dict[str, BaseException], results: Dict[str, Any]):
+        self.errors = errors
+        self.results = results
+        message = ", ".join(f"{name}: {error}" for name, error in errors.items())
+        super().__init__(message)
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """파이프라인 공유 스레드 풀 반환"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=int(getenv("PIPELINE_MAX_WORKERS", "8")),
+                thread_name_prefix="diagnosis-pipeline",
+            )
+        return _executor
+
+
+def run_concurrently(calls: Dict[str, Callable[[], Any]], timeout: Optional[float] = None) -> Dict[str, Any]:
+    """서로 독립적인 백엔드 호출을 동시에 실행하고 이름별 결과 반환
+
+    하나라도 실패하면 아직 시작하지 않은 호출은 취소하고, 이미 끝난 호출의
+    오류를 모아 PipelineError로 알린다. 전체 소요 시간은 가장 느린 호출에 맞춰진다.
+    """
+    executor = get_executor()
+    futures = {name: executor.submit(call) for name, call in calls.items()}
+    done, not_done = wait(futures.values(), timeout=timeout, return_when=FIRST_EXCEPTION)
+
+    results: Dict[str, Any] = {}
+    errors: Dict[str, BaseException] = {}
+    for name, future in futures.items():
+        if future in not_done:
+            # 실패 또는 타임아웃 시 대기 중인 호출은 취소 (이미 실행 중인 호출은 결과를 버림)
+            future.cancel()
+            continue
+        error = future.exception()
+        if error is not None:
+            errors[name] = error
+        else:
+            results[name] = future.result()
+
+    if not errors and not_done:
+        errors = {name: TimeoutError(f"{name} 호출이 {timeout}초 안에 끝나지 않았습니다.")
+                  for name, future in futures.items() if future in not_done}
+    if errors:
+        raise PipelineError(errors, results)
+    return results
@@ -0,0 +1,275 @@
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from services.config import getenv
+
+
+class BackendBusyError(Exception):
+    """백엔드가 혼잡해서 요청을 보내지 않고 바로 거절한 경우"""
+
+    def __init__(self, backend: str, message: str = "백엔드가 혼잡합니다."):
+        self.backend = backend
+        super().__init__(f"{backend}: {message}")
+
+
+class CircuitOpenError(BackendBusyError):
+    """연속 실패로 회로가 열려 있어 요청을 보내지 않은 경우"""
+
+    def __init__(self, backend: str, retry_after: float):
+        self.retry_after = retry_after
+        super().__init__(backend, f"연속 실패로 {retry_after:.0f}초 동안 요청을 보내지 않습니다.")
+
+
+def is_busy_error(error: BaseException) -> bool:
+    """BackendBusyError이거나 동시 실행 오류(PipelineError)에 포함된 경우"""
+    if isinstance(error, BackendBusyError):
+        return True
+    errors = getattr(error, "errors", None)
+    return isinstance(errors, dict) and any(isinstance(e, BackendBusyError) for e in errors.values())
+
+
+def is_backend_failure(error: BaseException) -> bool:
+    """백엔드 장애로 볼 오류 (연결 실패, 타임아웃, 5xx 응답). 4xx는 백엔드가 정상 응답한 것으로 본다"""
+    response = getattr(error, "response", None)
+    status = getattr(response, "status_code", None)
+    if status is not None:
+        return status >= 500
+    # requests 예외는 OSError의 하위 클래스
+    return isinstance(error, (OSError, TimeoutError))
+
+
+@dataclass(frozen=True)
+class ResilienceConfig:
+    """백엔드별 회로 차단기와 동시 요청 제한 설정"""
+    failure_threshold: int = 5         # 회로를 여는 연속 실패 횟수
+    reset_timeout: float = 30.0        # 회로를 연 뒤 시험 요청을 보내기까지의 시간 (초)
+    initial_limit: int = 32            # 동시 요청 수 초기 상한 (스트리밍 중인 최종 진단 포함)
+    min_limit: int = 1
+    max_limit: int = 256
+    queue_timeout: float = 0.5         # 상한에 걸렸을 때 자리가 나기를 기다리는 최대 시간 (초)
+    latency_tolerance: float = 2.0     # 기준 지연 시간의 몇 배부터 느려진 것으로 볼지
+
+    @classmethod
+    def from_env(cls) -> "ResilienceConfig":
+        """환경 변수에서 설정 읽기"""
+        return cls(
+            failure_threshold=int(getenv("CIRCUIT_FAILURE_THRESHOLD", cls.failure_threshold)),
+            reset_timeout=float(getenv("CIRCUIT_RESET_TIMEOUT", cls.reset_timeout)),
+            initial_limit=int(getenv("CONCURRENCY_INITIAL_LIMIT", cls.initial_limit)),
+            min_limit=int(getenv("CONCURRENCY_MIN_LIMIT", cls.min_limit)),
+            max_limit=int(getenv("CONCURRENCY_MAX_LIMIT", cls.max_limit)),
+            queue_timeout=float(getenv("CONCURRENCY_QUEUE_TIMEOUT", cls.queue_timeout)),
+            latency_tolerance=float(getenv("CONCURRENCY_LATENCY_TOLERANCE", cls.latency_tolerance)),
+        )
+
+
+class CircuitBreaker:
+    """연속 실패가 failure_threshold번이면 회로를 열고, reset_timeout 뒤 시험 요청 하나로 복구 여부 확인"""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, backend: str, failure_threshold: int = 5, reset_timeout: float = 30.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.backend = backend
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self._clock = clock
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def before_call(self):
+        """요청 전 확인 (회로가 열려 있으면 CircuitOpenError)"""
+        with self._lock:
+            if self.state == self.OPEN:
+                elapsed = self._clock() - self._opened_at
+                if elapsed < self.reset_timeout:
+                    raise CircuitOpenError(self.backend, self.reset_timeout - elapsed)
+                self.state = self.HALF_OPEN
+            if self.state == self.HALF_OPEN:
+                # 시험 요청은 한 번에 하나만
+                if self._probing:
+                    raise CircuitOpenError(self.backend, self.reset_timeout)
+                self._probing = True
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self._probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self._opened_at = self._clock()
+            self._probing = False
+
+    def record_ignored(self):
+        """성공도 실패도 아닌 결과 (요청을 보내지 못했거나 중간에 그만둔 경우)"""
+        with self._lock:
+            self._probing = False
+
+
+class AdaptiveConcurrencyLimiter:
+    """지연 시간을 보고 동시 요청 상한을 조절하는 제한기 (AIMD)
+
+    호출 종류별로 지난 baseline_window초 정도의 지연 시간 이동 평균을 기준으로 삼는다 (상한을 많이 쓰는
+    동안의 표본은 혼잡이 섞여 있으므로 10배 천천히 반영). 상한을 절반 이상 쓰고 있을 때
+    최근 지연 시간이 기준의 latency_tolerance배 이하이면 상한을 조금씩 올리고, 넘으면 곱으로 줄인다.
+    상한을 절반도 쓰지 않을 때 느려진 것은 동시 요청 수 때문이 아니므로 상한을 바꾸지 않는다.
+    같은 혼잡 구간에서 끝난 요청들이 연달아 상한을 깎지 않도록, 느려져서 줄인 뒤에는 최근 지연 시간만큼,
+    실패해서 줄인 뒤에는 decrease_interval초 동안 다시 줄이지 않는다. 실패는 사용량과 관계없이 반영한다.
+    상한에 걸린 요청은 queue_timeout까지만 기다리고
+    그 뒤에는 BackendBusyError로 바로 거절해 스레드가 쌓이지 않게 한다.
+    """
+
+    def __init__(self, backend: str, initial_limit: int = 32, min_limit: int = 1, max_limit: int = 256,
+                 queue_timeout: float = 0.5, latency_tolerance: float = 2.0, decrease_interval: float = 1.0,
+                 baseline_window: float = 60.0, clock: Callable[[], float] = time.monotonic):
+        self.backend = backend
+        self.limit = float(initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.queue_timeout = queue_timeout
+        self.latency_tolerance = latency_tolerance
+        self.decrease_interval = decrease_interval
+        self.baseline_window = baseline_window
+        self.inflight = 0
+        self.rejected = 0
+        self._clock = clock
+        self._baseline: Dict[str, float] = {}
+        self._smoothed: Dict[str, float] = {}
+        self._sampled_at: Dict[str, float] = {}
+        self._last_decrease = float("-inf")
+        self._cond = threading.Condition()
+
+    def acquire(self):
+        """자리를 얻을 때까지 최대 queue_timeout초 대기 (못 얻으면 BackendBusyError)"""
+        deadline = self._clock() + self.queue_timeout
+        with self._cond:
+            while self.inflight >= int(self.limit):
+                remaining = deadline - self._clock()
+                if remaining <= 0:
+                    self.rejected += 1
+                    raise BackendBusyError(self.backend)
+                self._cond.wait(remaining)
+            self.inflight += 1
+
+    def release(self, operation: str, latency: Optional[float], failed: bool):
+        """자리 반환과 함께 결과를 반영해 상한 조절"""
+        with self._cond:
+            utilized = self.inflight >= self.limit / 2
+            self.inflight -= 1
+            if failed:
+                self._decrease(0.8, self.decrease_interval)
+            elif latency is not None:
+                now = self._clock()
+                baseline = self._baseline.get(operation, latency)
+                smoothed = self._smoothed.get(operation, latency) * 0.8 + latency * 0.2
+                self._smoothed[operation] = smoothed
+                congested = smoothed > baseline * self.latency_tolerance
+                # 표본 수가 아니라 시간 기준으로 갱신해야 동시 요청이 많을수록 기준값이 빨리 따라가지 않음
+                window = self.baseline_window * (10 if utilized else 1)
+                elapsed = now - self._sampled_at.get(operation, now)
+                self._baseline[operation] = baseline + (latency - baseline) * min(1.0, elapsed / window)
+                self._sampled_at[operation] = now
+                if utilized:
+                    if congested:
+                        self._decrease(0.9, smoothed)
+                    else:
+                        self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+            self._cond.notify()
+
+    def _decrease(self, factor: float, interval: float):
+        now = self._clock()
+        if now - self._last_decrease >= interval:
+            self.limit = max(self.min_limit, self.limit * factor)
+            self._last_decrease = now
+
+
+class _GuardedCall:
+    def __init__(self, guard: "BackendGuard", operation: str):
+        self.guard = guard
+        self.operation = operation
+        self.latency: Optional[float] = None
+        self._start = 0.0
+
+    def observe(self, response):
+        """응답 헤더까지의 시간을 지연 시간 표본으로 사용 (스트리밍 호출 포함)"""
+        elapsed = getattr(response, "elapsed", None)
+        self.latency = elapsed.total_seconds() if elapsed is not None else time.monotonic() - self._start
+
+    def __enter__(self) -> "_GuardedCall":
+        self.guard.breaker.before_call()
+        try:
+            self.guard.limiter.acquire()
+        except BackendBusyError:
+            self.guard.breaker.record_ignored()
+            raise
+        self._start = time.monotonic()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        failed = exc is not None and is_backend_failure(exc)
+        latency = self.latency
+        if latency is None and exc is None:
+            latency = time.monotonic() - self._start
+        self.guard.limiter.release(self.operation, latency, failed)
+        if failed:
+            self.guard.breaker.record_failure()
+        elif isinstance(exc, GeneratorExit):
+            self.guard.breaker.record_ignored()
+        else:
+            self.guard.breaker.record_success()
+        return False
+
+
+class BackendGuard:
+    """백엔드 하나의 회로 차단기와 동시 요청 제한기"""
+
+    def __init__(self, backend: str, config: ResilienceConfig):
+        self.backend = backend
+        self.breaker = CircuitBreaker(backend, config.failure_threshold, config.reset_timeout)
+        self.limiter = AdaptiveConcurrencyLimiter(
+            backend,
+            initial_limit=config.initial_limit,
+            min_limit=config.min_limit,
+            max_limit=config.max_limit,
+            queue_timeout=config.queue_timeout,
+            latency_tolerance=config.latency_tolerance,
+        )
+
+    def call(self, operation: str) -> _GuardedCall:
+        """with 블록 하나를 백엔드 호출 하나로 보호"""
+        return _GuardedCall(self, operation)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "state": self.breaker.state,
+            "consecutive_failures": self.breaker.failures,
+            "limit": round(self.limiter.limit, 2),
+            "inflight": self.limiter.inflight,
+            "rejected": self.limiter.rejected,
+        }
+
+
+_guards: Dict[Tuple[str, str], BackendGuard] = {}
+_guards_lock = threading.Lock()
+
+
+def get_backend_guard(backend: str, base_url: str, config: Optional[ResilienceConfig] = None) -> BackendGuard:
+    """프로세스 전체에서 공유되는 백엔드별 보호 장치 반환"""
+    key = (backend, base_url.rstrip("/"))
+    with _guards_lock:
+        guard = _guards.get(key)
+        if guard is None:
+            guard = _guards[key] = BackendGuard(backend, config or ResilienceConfig.from_env())
+        return guard
@@ -0,0 +1,198 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from services.config import getenv
+
+CachedResult = Dict[str, Any]
+
+
+def image_cache_key(image_bytes: bytes, body_part: str, scope: Optional[str] = None) -> str:
+    """(전처리된) 이미지 내용과 부위로 캐시 키 생성 (scope가 있으면 그 범위 안에서만 같은 키)"""
+    key = f"{hashlib.sha256(image_bytes).hexdigest()}:{body_part}"
+    return f"{scope}:{key}" if scope else key
+
+
+def _encode(value: CachedResult) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+class MemoryCacheBackend:
+    """TTL과 LRU 제거, 메모리 상한을 지원하는 프로세스 내 캐시"""
+
+    def __init__(self, ttl: float, max_entries: int, max_bytes: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, Tuple[float, int, CachedResult]]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[CachedResult]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, size, value = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                self._size -= size
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: CachedResult, size: int):
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._size -= old[1]
+            self._entries[key] = (time.time() + self.ttl, size, value)
+            self._size += size
+            # 가장 오래 사용하지 않은 항목부터 제거
+            while len(self._entries) > self.max_entries or self._size > self.max_bytes:
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self._size -= evicted_size
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+
+class DiskCacheBackend:
+    """여러 Streamlit 워커 프로세스가 함께 쓰는 SQLite 기반 캐시"""
+
+    def __init__(self, path: str, ttl: float, max_bytes: int):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                " key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL,"
+                " expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS results_accessed_at ON results (accessed_at)")
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Optional[CachedResult]:
+        conn = self._connect()
+        now = time.time()
+        row = conn.execute("SELECT value, expires_at FROM results WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        if row[1] <= now:
+            conn.execute("DELETE FROM results WHERE key = ?", (key,))
+            return None
+        conn.execute("UPDATE results SET accessed_at = ? WHERE key = ?", (now, key))
+        return json.loads(row[0])
+
+    def set(self, key: str, value: CachedResult, encoded: str):
+        if len(encoded) > self.max_bytes:
+            return
+        conn = self._connect()
+        now = time.time()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute(
+                "INSERT OR REPLACE INTO results (key, value, size, expires_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (key, encoded, len(encoded), now + self.ttl, now),
+            )
+            conn.execute("DELETE FROM results WHERE expires_at <= ?", (now,))
+            # 용량 초과 시 가장 오래 사용하지 않은 항목부터 제거
+            total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+            if total > self.max_bytes:
+                rows = conn.execute("SELECT key, size FROM results ORDER BY accessed_at").fetchall()
+                for evict_key, size in rows:
+                    if total <= self.max_bytes:
+                        break
+                    conn.execute("DELETE FROM results WHERE key = ?", (evict_key,))
+                    total -= size
+
+    def clear(self):
+        self._connect().execute("DELETE FROM results")
+
+
+class ResultCache:
+    """1단계(업로드/검증/분류/설명) 결과 캐시
+
+    메모리 캐시를 먼저 보고, 없으면 디스크 캐시(설정된 경우)에서 찾아 메모리로 올린다.
+    """
+
+    def __init__(self, memory: MemoryCacheBackend, disk: Optional[DiskCacheBackend] = None):
+        self.memory = memory
+        self.disk = disk
+
+    @classmethod
+    def from_env(cls) -> "ResultCache":
+        """환경 변수에서 캐시 설정 읽기"""
+        ttl = float(getenv("RESULT_CACHE_TTL", "3600"))
+        memory = MemoryCacheBackend(
+            ttl=ttl,
+            max_entries=int(getenv("RESULT_CACHE_MAX_ENTRIES", "256")),
+            max_bytes=int(getenv("RESULT_CACHE_MAX_BYTES", str(16 * 1024 * 1024))),
+        )
+        disk = None
+        cache_dir = getenv("RESULT_CACHE_DIR")
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+            disk = DiskCacheBackend(
+                os.path.join(cache_dir, "results.sqlite3"),
+                ttl=ttl,
+                max_bytes=int(getenv("RESULT_CACHE_DISK_MAX_BYTES", str(256 * 1024 * 1024))),
+            )
+        return cls(memory, disk)
+
+    def get(self, key: str) -> Optional[CachedResult]:
+        value = self.memory.get(key)
+        if value is None and self.disk is not None:
+            value = self.disk.get(key)
+            if value is not None:
+                self.memory.set(key, value, len(_encode(value)))
+        return value
+
+    def set(self, key: str, value: CachedResult):
+        encoded = _encode(value)
+        self.memory.set(key, value, len(encoded))
+        if self.disk is not None:
+            self.disk.set(key, value, encoded)
+
+    def clear(self):
+        self.memory.clear()
+        if self.disk is not None:
+            self.disk.clear()
+
+
+_cache: Optional[ResultCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_result_cache() -> ResultCache:
+    """프로세스 전체에서 공유되는 결과 캐시 반환"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ResultCache.from_env()
+        return _cache
@@ -0,0 +1,164 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from services.catalog import SYMPTOMS
+from services.config import getenv
+
+
+class DiagnosisSession:
+    """사용자 한 명의 진단 진행 상태
+
+    st.session_state에는 이 객체 하나만 두고, 선택한 증상은 카탈로그 순서의 비트셋으로 보관한다.
+    이미지처럼 큰 데이터는 여기에 두지 않고 SessionStore에 맡겨 프로세스 전체 메모리 상한을 적용받게 한다.
+    """
+
+    __slots__ = ("session_id", "diagnosis_id", "current_step", "diagnosis_complete", "selected_body_part",
+                 "symptom_bits", "symptoms_submitted", "preprocess_file_id", "analyze_job_key")
+
+    def __init__(self):
+        self.session_id = uuid.uuid4().hex
+        self.reset()
+
+    def reset(self):
+        """처음 상태로 되돌림 (session_id는 유지)"""
+        self.diagnosis_id: Optional[str] = None
+        self.current_step = 1
+        self.diagnosis_complete = False
+        self.selected_body_part: Optional[str] = None
+        self.symptom_bits = 0
+        self.symptoms_submitted = False
+        self.preprocess_file_id: Optional[str] = None
+        self.analyze_job_key: Optional[str] = None
+
+    def set_symptom(self, enum: str, selected: bool):
+        bit = 1 << SYMPTOMS.index(enum)
+        self.symptom_bits = self.symptom_bits | bit if selected else self.symptom_bits & ~bit
+
+    def has_symptom(self, enum: str) -> bool:
+        return bool(self.symptom_bits >> SYMPTOMS.index(enum) & 1)
+
+    def selected_symptoms(self) -> List[str]:
+        """선택한 증상 enum 목록 (카탈로그 순서)"""
+        return [enum for i, enum in enumerate(SYMPTOMS.enums) if self.symptom_bits >> i & 1]
+
+
+class _SessionEntry:
+    __slots__ = ("artifacts", "nbytes", "last_seen")
+
+    def __init__(self, now: float):
+        self.artifacts: Dict[str, Tuple[Any, int]] = {}
+        self.nbytes = 0
+        self.last_seen = now
+
+
+class SessionStore:
+    """세션별 큰 데이터(전처리된 업로드 이미지 등)를 보관하는 프로세스 공용 저장소
+
+    idle_seconds 동안 접근이 없는 세션의 데이터는 내리고, 전체 크기가 max_bytes를 넘으면
+    가장 오래 사용하지 않은 세션의 데이터부터 내린다. 내린 데이터는 get에서 None이 되므로
+    호출하는 쪽은 원본에서 다시 만들 수 있어야 한다.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, idle_seconds: float = 900.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.max_bytes = max_bytes
+        self.idle_seconds = idle_seconds
+        self.evicted = 0
+        self._clock = clock
+        self._sessions: "OrderedDict[str, _SessionEntry]" = OrderedDict()
+        self._nbytes = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "SessionStore":
+        """환경 변수에서 저장소 설정 읽기"""
+        return cls(
+            max_bytes=int(getenv("SESSION_STORE_MAX_BYTES", str(64 * 1024 * 1024))),
+            idle_seconds=float(getenv("SESSION_IDLE_SECONDS", "900")),
+        )
+
+    def _entry(self, session_id: str, now: float) -> _SessionEntry:
+        entry = self._sessions.get(session_id)
+        if entry is None:
+            entry = self._sessions[session_id] = _SessionEntry(now)
+        else:
+            entry.last_seen = now
+            self._sessions.move_to_end(session_id)
+        return entry
+
+    def _drop(self, session_id: str):
+        entry = self._sessions.pop(session_id)
+        self._nbytes -= entry.nbytes
+        if entry.artifacts:
+            self.evicted += 1
+
+    def _evict(self, now: float, keep: Optional[str] = None):
+        # 오래된 세션이 앞쪽에 있으므로 앞에서부터 확인
+        for session_id in list(self._sessions):
+            if session_id == keep:
+                continue
+            idle = now - self._sessions[session_id].last_seen >= self.idle_seconds
+            if not idle and self._nbytes <= self.max_bytes:
+                break
+            self._drop(session_id)
+
+    def touch(self, session_id: str):
+        """세션이 사용 중임을 기록하고 오래 쉬고 있는 다른 세션의 데이터 정리"""
+        with self._lock:
+            now = self._clock()
+            self._entry(session_id, now)
+            self._evict(now, keep=session_id)
+
+    def put(self, session_id: str, name: str, value: Any, nbytes: int):
+        """데이터 보관 (nbytes는 메모리 상한 계산에 쓰는 대략적인 크기)"""
+        with self._lock:
+            now = self._clock()
+            entry = self._entry(session_id, now)
+            _, old_nbytes = entry.artifacts.get(name, (None, 0))
+            entry.artifacts[name] = (value, nbytes)
+            entry.nbytes += nbytes - old_nbytes
+            self._nbytes += nbytes - old_nbytes
+            self._evict(now, keep=session_id)
+
+    def get(self, session_id: str, name: str) -> Any:
+        """보관한 데이터 (없거나 내려졌으면 None)"""
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            if entry is None:
+                return None
+            artifact = entry.artifacts.get(name)
+            return artifact[0] if artifact is not None else None
+
+    def discard(self, session_id: str, name: Optional[str] = None):
+        """세션의 데이터 하나(name이 없으면 전부) 삭제"""
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            if entry is None:
+                return
+            if name is None:
+                self._nbytes -= entry.nbytes
+                del self._sessions[session_id]
+                return
+            _, nbytes = entry.artifacts.pop(name, (None, 0))
+            entry.nbytes -= nbytes
+            self._nbytes -= nbytes
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"sessions": len(self._sessions), "bytes": self._nbytes, "evicted": self.evicted}
+
+
+_store: Optional[SessionStore] = None
+_store_lock = threading.Lock()
+
+
+def get_session_store() -> SessionStore:
+    """프로세스 전체에서 공유되는 세션 저장소 반환"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = SessionStore.from_env()
+        return _store
@@ -0,0 +1,159 @@
+import json
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional
+
+
+class SSEEvent(NamedTuple):
+    """디스패치된 SSE 이벤트"""
+    data: str
+    event: str = "message"
+    id: Optional[str] = None
+    retry: Optional[int] = None
+
+
+# NamedTuple 생성자를 거치지 않는 빠른 생성 경로
+_new_event = tuple.__new__
+
+
+class SSEParser:
+    """바이트 청크를 받아 SSE 이벤트를 만드는 증분 파서
+
+    네트워크 청크 경계와 상관없이 동작하며, 여러 줄 data 필드와
+    event/id/retry 필드, 주석 줄을 표준(HTML Living Standard)대로 처리한다.
+    """
+
+    def __init__(self):
+        self._buffer = bytearray()
+        self._data_lines: List[str] = []
+        self._event_type = ""
+        self.last_event_id: Optional[str] = None
+        self.retry: Optional[int] = None
+
+    def feed(self, chunk: bytes) -> List[SSEEvent]:
+        """청크를 추가하고 완성된 이벤트 목록 반환"""
+        buffer = self._buffer
+        buffer += chunk
+        end = max(buffer.rfind(b"\n"), buffer.rfind(b"\r"))
+        # 버퍼 끝의 CR은 다음 청크의 LF와 이어질 수 있으므로 보류 (스트림이 끝나면 close에서 처리)
+        if end != -1 and end == len(buffer) - 1 and buffer[end] == 0x0D:
+            end = max(buffer.rfind(b"\n", 0, end), buffer.rfind(b"\r", 0, end))
+        if end == -1:
+            return []
+
+        # 완성된 줄들을 한 번에 디코딩 (줄 끝은 ASCII이므로 UTF-8 문자가 잘리지 않음)
+        with memoryview(buffer) as view:
+            block = str(view[:end + 1], "utf-8", "replace")
+        del buffer[:end + 1]
+        if "\r" in block:
+            block = block.replace("\r\n", "\n").replace("\r", "\n")
+
+        # 빈 줄(이벤트 경계)로 나눈 뒤, 대부분을 차지하는 data 한 줄짜리 이벤트는 줄 단위 처리 없이 생성
+        # (디스패치 직후에는 이전 이벤트의 상태가 남아 있지 않으므로 첫 조각만 확인하면 됨)
+        events: List[SSEEvent] = []
+        append = events.append
+        pieces = block.split("\n\n")
+        tail = pieces.pop()  # 마지막 빈 줄 뒤의 아직 디스패치되지 않은 줄들
+        clean = not self._data_lines and not self._event_type
+        event_id, retry = self.last_event_id, self.retry
+        for piece in pieces:
+            if clean and piece[:6] == "data: " and "\n" not in piece:
+                append(_new_event(SSEEvent, (piece[6:], "message", event_id, retry)))
+            else:
+                self._process_lines(piece.split("\n"), events)
+                self._dispatch(events)
+                clean = True
+                event_id, retry = self.last_event_id, self.retry
+        if tail:
+            lines = tail.split("\n")
+            lines.pop()  # 마지막 줄 끝 뒤의 빈 문자열
+            self._process_lines(lines, events)
+        return events
+
+    def close(self) -> List[SSEEvent]:
+        """스트림 종료 처리 (보류한 끝의 CR을 줄 끝으로 처리한 이벤트 반환)
+
+        빈 줄로 끝나지 않은 마지막 이벤트는 표준대로 버린다.
+        """
+        events = self.feed(b"\n") if self._buffer.endswith(b"\r") else []
+        self._buffer.clear()
+        self._data_lines.clear()
+        self._event_type = ""
+        return events
+
+    def _dispatch(self, events: List[SSEEvent]):
+        # 빈 줄에서 이벤트 디스패치 (data가 없으면 이벤트 타입만 초기화)
+        data_lines = self._data_lines
+        if data_lines:
+            data = data_lines[0] if len(data_lines) == 1 else "\n".join(data_lines)
+            events.append(_new_event(SSEEvent, (data, self._event_type or "message", self.last_event_id, self.retry)))
+            data_lines.clear()
+        self._event_type = ""
+
+    def _process_lines(self, lines: List[str], events: List[SSEEvent]):
+        data_lines = self._data_lines
+        for line in lines:
+            if not line:
+                self._dispatch(events)
+            elif line.startswith("data:"):
+                data_lines.append(line[6:] if line.startswith(" ", 5) else line[5:])
+            elif line[0] != ":":  # ':' 로 시작하는 줄은 주석
+                self._process_field(line)
+
+    def iter_events(self, chunks: Iterable[bytes]) -> Iterator[SSEEvent]:
+        """바이트 청크 스트림에서 이벤트를 순서대로 반환 (스트림이 끝나면 close까지 처리)"""
+        for chunk in chunks:
+            if chunk:
+                yield from self.feed(chunk)
+        yield from self.close()
+
+    def _process_field(self, line: str):
+        field, colon, value = line.partition(":")
+        if colon and value.startswith(" "):
+            value = value[1:]
+
+        if field == "data":
+            self._data_lines.append(value)
+        elif field == "event":
+            self._event_type = value
+        elif field == "id":
+            if "\x00" not in value:
+                self.last_event_id = value
+        elif field == "retry":
+            if value.isascii() and value.isdigit():
+                self.retry = int(value)
+
+def parse_json_data(event: SSEEvent) -> Optional[Dict[str, Any]]:
+    """이벤트의 data를 JSON으로 파싱 (JSON이 아니면 None)"""
+    try:
+        return json.loads(event.data)
+    except json.JSONDecodeError:
+        return None
+
+
+class TextAccumulator:
+    """스트리밍 청크를 리스트에 모았다가 필요할 때 한 번에 합치는 버퍼
+
+    문자열 += 반복으로 인한 재복사를 피하고, getvalue() 결과를 캐시해
+    같은 내용을 여러 번 합치지 않는다.
+    """
+
+    __slots__ = ("_parts", "append")
+
+    def __init__(self):
+        self._parts: List[str] = []
+        # 청크마다 메서드 호출 비용이 들지 않도록 list.append를 그대로 노출
+        self.append = self._parts.append
+
+    def getvalue(self) -> str:
+        parts = self._parts
+        if len(parts) > 1:
+            parts[:] = ["".join(parts)]
+        return parts[0] if parts else ""
+
+    def clear(self):
+        del self._parts[:]
+
+    def __len__(self) -> int:
+        return sum(map(len, self._parts))
+
+    def __str__(self) -> str:
+        return self.getvalue()
@@ -0,0 +1,68 @@
+import time
+from typing import Callable, Optional
+
+from services.config import getenv
+from services.sse import TextAccumulator
+
+
+class ThrottledRenderer:
+    """스트리밍 청크를 시간과 크기 기준으로 묶어서 렌더링
+
+    첫 청크는 바로 그리고, 이후에는 마지막 렌더링 후 min_interval이 지났거나
+    쌓인 글자 수가 max_pending_chars 이상일 때만 다시 그린다. 다음 청크가 늦게 오면 남은 내용이
+    보이지 않으므로, 청크를 기다리는 쪽에서 tick()을 주기적으로 호출해 시간이 지난 내용을 그린다.
+    with 블록을 벗어날 때는 정상 종료든 오류든 남은 내용을 항상 그린다.
+    """
+
+    def __init__(self, render: Callable[[str], None], min_interval: Optional[float] = None,
+                 max_pending_chars: Optional[int] = None, clock: Callable[[], float] = time.monotonic):
+        self._render = render
+        self._clock = clock
+        self.min_interval = (min_interval if min_interval is not None
+                             else int(getenv("RENDER_MIN_INTERVAL_MS", "50")) / 1000)
+        self.max_pending_chars = (max_pending_chars if max_pending_chars is not None
+                                  else int(getenv("RENDER_MAX_PENDING_CHARS", "2000")))
+        self.text = TextAccumulator()
+        self.render_count = 0
+        self._pending_chars = 0
+        self._last_render: Optional[float] = None
+
+    def push(self, chunk: str):
+        """청크 추가 (필요한 경우에만 렌더링)"""
+        if not chunk:
+            return
+        self.text.append(chunk)
+        self._pending_chars += len(chunk)
+        now = self._clock()
+        if (self._last_render is None
+                or now - self._last_render >= self.min_interval
+                or self._pending_chars >= self.max_pending_chars):
+            self._flush(now)
+
+    def tick(self):
+        """새 청크가 없어도 마지막 렌더링 후 min_interval이 지났으면 남은 내용을 렌더링"""
+        if self._pending_chars:
+            now = self._clock()
+            if now - self._last_render >= self.min_interval:
+                self._flush(now)
+
+    def flush(self):
+        """아직 그리지 않은 내용을 즉시 렌더링"""
+        if self._pending_chars:
+            self._flush(self._clock())
+
+    def getvalue(self) -> str:
+        return self.text.getvalue()
+
+    def _flush(self, now: float):
+        self._render(self.text.getvalue())
+        self.render_count += 1
+        self._pending_chars = 0
+        self._last_render = now
+
+    def __enter__(self) -> "ThrottledRenderer":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.flush()
+        return False
@@ -0,0 +1,16 @@
+import pytest
+
+
+class FakeClock:
+    """테스트에서 직접 움직이는 시계 (time.monotonic 대신 clock 인자로 주입)"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    return FakeClock()
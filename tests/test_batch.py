@@ -0,0 +1,144 @@
+import io
+import itertools
+import json
+
+import pytest
+from PIL import Image
+
+from services import batch
+from services.batch import BatchItem, BatchRunner, TokenBucket, load_checkpoint
+from services.image_preprocess import ImagePreprocessConfig
+
+
+class FakeAPI:
+    """배치 진단 흐름을 흉내 내는 APIService (fail_ids의 최종 진단은 실패)"""
+
+    def __init__(self, fail_ids=()):
+        self.fail_ids = set(fail_ids)
+        self.diagnosed = []
+        self._ids = itertools.count(1)
+
+    def upload_image(self, image_file, body_part, filename="image.jpg", content_type=None):
+        return {"diagnosisId": f"diag-{next(self._ids)}"}
+
+    def validate_image(self, diagnosis_id):
+        return {"is_skin_related": True}
+
+    def classify_image(self, diagnosis_id):
+        return {"class": "rash"}
+
+    def get_image_description(self, diagnosis_id):
+        return {"description": "red"}
+
+    def submit_symptoms(self, diagnosis_id, symptoms):
+        return {"status": "success"}
+
+    def submit_other_symptoms(self, diagnosis_id, other_symptoms):
+        return {}
+
+    def get_final_diagnosis(self, diagnosis_id):
+        self.diagnosed.append(diagnosis_id)
+        yield {"chunk": "보습제를 "}
+        if diagnosis_id in self.fail_ids:
+            raise ConnectionError("stream dropped")
+        yield {"chunk": "발라주세요"}
+
+
+@pytest.fixture
+def image_path(tmp_path):
+    output = io.BytesIO()
+    Image.new("RGB", (8, 8), (200, 80, 80)).save(output, format="JPEG")
+    path = tmp_path / "a.jpg"
+    path.write_bytes(output.getvalue())
+    return str(path)
+
+
+def _items(image_path, ids):
+    return [BatchItem(id=i, image_path=image_path, body_part="CHEEKS", symptoms=["RASH"]) for i in ids]
+
+
+def _runner(api):
+    return BatchRunner(api, concurrency=2, preprocess_config=ImagePreprocessConfig())
+
+
+def _records(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_token_bucket_allows_burst_then_paces(clock, monkeypatch):
+    slept = []
+
+    def sleep(seconds):
+        slept.append(seconds)
+        clock.now += seconds
+
+    monkeypatch.setattr(batch.time, "sleep", sleep)
+    bucket = TokenBucket(rate=2, burst=3, clock=clock)
+    for _ in range(3):
+        bucket.acquire()
+    assert slept == []
+    bucket.acquire()
+    assert sum(slept) == pytest.approx(0.5)
+    clock.now += 10
+    for _ in range(3):
+        bucket.acquire()
+    # 오래 쉬어도 burst개까지만 모아 둠
+    assert sum(slept) == pytest.approx(0.5)
+    bucket.acquire()
+    assert sum(slept) == pytest.approx(1.0)
+
+
+def test_load_checkpoint(tmp_path):
+    path = tmp_path / "results.jsonl"
+    assert load_checkpoint(str(path)) == set()
+    path.write_text(
+        '{"id": "a", "status": "ok"}\n'
+        '{"id": "b", "status": "error"}\n'
+        '{"id": "c", "status": "not_skin"}\n'
+        '{"id": "b", "status": "ok"}\n'
+        '{"id": "d", "status": "error"}\n'
+        '{"id": "e", "sta',
+        encoding="utf-8",
+    )
+    assert load_checkpoint(str(path)) == {"a", "b", "c"}
+
+
+def test_resume_retries_only_errors(tmp_path, image_path):
+    output = str(tmp_path / "results.jsonl")
+    api = FakeAPI(fail_ids={"diag-2"})
+    counts = _runner(api).run(_items(image_path, ["x"]) + _items(image_path, ["y"]), output)
+    assert counts == {"skipped": 0, "ok": 1, "not_skin": 0, "error": 1}
+    failed = next(record for record in _records(output) if record["status"] == "error")
+    assert "stream dropped" in failed["error"]
+
+    api = FakeAPI()
+    counts = _runner(api).run(_items(image_path, ["x", "y"]), output)
+    assert counts == {"skipped": 1, "ok": 1, "not_skin": 0, "error": 0}
+    assert len(api.diagnosed) == 1
+    assert load_checkpoint(output) == {"x", "y"}
+    ok = [record for record in _records(output) if record["status"] == "ok"]
+    assert {record["diagnosis"] for record in ok} == {"보습제를 발라주세요"}
+
+
+def test_skipped_counts_only_input_ids(tmp_path, image_path):
+    output = str(tmp_path / "results.jsonl")
+    _runner(FakeAPI()).run(_items(image_path, ["a", "b", "c"]), output)
+    counts = _runner(FakeAPI()).run(iter(_items(image_path, ["a", "z"])), output)
+    assert counts == {"skipped": 1, "ok": 1, "not_skin": 0, "error": 0}
+
+
+def test_no_resume_overwrites_output(tmp_path, image_path):
+    output = str(tmp_path / "results.jsonl")
+    _runner(FakeAPI()).run(_items(image_path, ["a", "b"]), output)
+    counts = _runner(FakeAPI()).run(_items(image_path, ["a"]), output, resume=False)
+    assert counts["skipped"] == 0 and counts["ok"] == 1
+    assert [record["id"] for record in _records(output)] == ["a"]
+
+
+def test_invalid_item_is_recorded_as_error(tmp_path, image_path):
+    output = str(tmp_path / "results.jsonl")
+    item = BatchItem(id="bad", image_path=image_path, body_part="ELBOW?", symptoms=["RASH"])
+    counts = _runner(FakeAPI()).run([item], output)
+    assert counts["error"] == 1
+    assert "알 수 없는 부위" in _records(output)[0]["error"]
@@ -0,0 +1,97 @@
+import pytest
+
+from services.chunk_log import ChunkLogStore
+from services.diagnosis import stream_final_diagnosis
+
+
+class _Cancelled(Exception):
+    pass
+
+
+class FakeAPI:
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.calls = []
+
+    def get_final_diagnosis(self, diagnosis_id, last_event_id=None):
+        self.calls.append(last_event_id)
+        start = int(last_event_id or 0)
+        for i, text in enumerate(self.chunks[start:], start + 1):
+            yield {"chunk": text, "id": str(i)}
+
+
+def test_discarded_log_ignores_late_appends(tmp_path):
+    store = ChunkLogStore(spill_dir=str(tmp_path))
+    log = store.open("diag-1")
+    log.append("old ", "1")
+    store.discard("diag-1")
+    # 취소된 작업이 아직 들고 있는 로그에 기록해도 파일이 다시 생기지 않음
+    log.append("late ", "2")
+    log.mark_complete()
+    assert list(tmp_path.iterdir()) == []
+    assert store.get("diag-1") is None
+    assert len(store.open("diag-1")) == 0
+
+
+def test_reset_log_keeps_recording(tmp_path):
+    store = ChunkLogStore(spill_dir=str(tmp_path))
+    log = store.open("diag-1")
+    log.append("a", None)
+    log.reset()
+    log.append("b", "1")
+    log.mark_complete()
+    reloaded = ChunkLogStore(spill_dir=str(tmp_path)).get("diag-1")
+    assert reloaded.text() == "b" and reloaded.complete
+
+
+def test_cancelled_stream_stops_before_recording(tmp_path):
+    store = ChunkLogStore(spill_dir=str(tmp_path))
+    api = FakeAPI(["a", "b", "c"])
+    cancelled = []
+
+    def check_cancelled():
+        if cancelled:
+            raise _Cancelled()
+
+    stream = stream_final_diagnosis(api, "diag-1", store.open("diag-1"), check_cancelled=check_cancelled)
+    assert next(stream) == "a"
+    store.discard("diag-1")
+    cancelled.append(True)
+    with pytest.raises(_Cancelled):
+        next(stream)
+    assert store.get("diag-1") is None
+
+
+def test_resume_and_replay_from_log(tmp_path):
+    store = ChunkLogStore(spill_dir=str(tmp_path))
+    log = store.open("diag-1")
+    log.append("a", "1")
+    api = FakeAPI(["a", "b", "c"])
+    assert list(stream_final_diagnosis(api, "diag-1", log)) == ["a", "b", "c"]
+    assert api.calls == ["1"]
+    assert list(stream_final_diagnosis(api, "diag-1", log)) == ["a", "b", "c"]
+    assert api.calls == ["1"]
+
+
+def test_evicts_stale_incomplete_logs_over_budget(clock):
+    store = ChunkLogStore(max_bytes=10, stale_seconds=60, clock=clock)
+    store.open("abandoned").append("12345", "1")
+    clock.now = 30
+    store.open("active").append("12345", "1")
+    store.open("done").append("1", "1")
+    store.get("done").mark_complete()
+    clock.now = 70
+    # 예산을 넘으면 끝난 로그를 먼저 내리고, 그래도 넘으면 60초 넘게 멈춘 미완료 로그를 내림
+    store.open("new").append("12345", "1")
+    assert store.get("done") is None
+    assert store.get("abandoned") is None
+    assert store.get("active").text() == "12345"
+    assert store.get("new").text() == "12345"
+
+
+def test_does_not_evict_incomplete_logs_that_are_still_receiving(clock):
+    store = ChunkLogStore(max_bytes=5, stale_seconds=60, clock=clock)
+    store.open("a").append("12345", "1")
+    clock.now = 10
+    store.open("b").append("12345", "1")
+    assert store.get("a") is not None and store.get("b") is not None
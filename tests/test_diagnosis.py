@@ -0,0 +1,46 @@
+from services.diagnosis import analyze_image
+from services.image_preprocess import PreprocessedImage
+from services.result_cache import MemoryCacheBackend, ResultCache
+
+IMAGE = PreprocessedImage(b"\xff\xd8\xff image", "image/jpeg", "a.jpg", 1, 1, 10)
+
+
+class FakeAPI:
+    def __init__(self):
+        self.uploads = 0
+
+    def upload_image(self, data, body_part, filename, content_type):
+        self.uploads += 1
+        return {"diagnosisId": f"diag-{self.uploads}"}
+
+    def validate_image(self, diagnosis_id):
+        return {"is_skin_related": True}
+
+    def classify_image(self, diagnosis_id):
+        return {"class": "rash"}
+
+    def get_image_description(self, diagnosis_id):
+        return {"description": "red"}
+
+
+def _cache():
+    return ResultCache(MemoryCacheBackend(ttl=60, max_entries=10, max_bytes=1024 * 1024))
+
+
+def test_cached_result_is_reused_within_session():
+    api, cache = FakeAPI(), _cache()
+    first = analyze_image(api, IMAGE, "CHEEKS", cache, session_id="a")
+    again = analyze_image(api, IMAGE, "CHEEKS", cache, session_id="a")
+    assert first["cached"] is False and again["cached"] is True
+    assert again["diagnosisId"] == first["diagnosisId"]
+    assert again["classification"] == {"class": "rash"}
+    assert api.uploads == 1
+
+
+def test_other_session_gets_its_own_diagnosis_id():
+    api, cache = FakeAPI(), _cache()
+    first = analyze_image(api, IMAGE, "CHEEKS", cache, session_id="a")
+    other = analyze_image(api, IMAGE, "CHEEKS", cache, session_id="b")
+    assert other["cached"] is False
+    assert other["diagnosisId"] != first["diagnosisId"]
+    assert analyze_image(api, IMAGE, "CHEEKS", cache, session_id="a")["diagnosisId"] == first["diagnosisId"]
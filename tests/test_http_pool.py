@@ -0,0 +1,130 @@
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+import urllib3.util.connection
+
+from services.api_service import APIService
+from services.http_pool import PoolConfig
+from services.resilience import CircuitOpenError, ResilienceConfig
+
+CONFIG = PoolConfig(connect_timeout=0.5, read_timeout=0.3, max_retries=2, retry_backoff=0.0)
+
+
+class _Server:
+    """요청마다 정해진 동작을 하는 로컬 HTTP 서버 (받은 요청 수를 셈)"""
+
+    def __init__(self, behavior):
+        self.requests = 0
+        self.release = threading.Event()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                server.requests += 1
+                self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                behavior(self, server)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.release.set()
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def _respond(status):
+    def behavior(handler, server):
+        handler.send_response(status)
+        handler.send_header("Content-Type", "application/json")
+        handler.send_header("Content-Length", "2")
+        handler.end_headers()
+        handler.wfile.write(b"{}")
+    return behavior
+
+
+def _drop_connection(handler, server):
+    handler.close_connection = True
+    handler.connection.shutdown(socket.SHUT_RDWR)
+
+
+def _hang(handler, server):
+    server.release.wait(5)
+
+
+@pytest.fixture
+def serve(monkeypatch):
+    servers = []
+
+    def start(behavior, failure_threshold=10):
+        server = _Server(behavior)
+        servers.append(server)
+        monkeypatch.setenv("FASTAPI_API_URL", server.url)
+        monkeypatch.setenv("SPRINGBOOT_API_URL", server.url)
+        api = APIService(CONFIG, resilience_config=ResilienceConfig(failure_threshold=failure_threshold))
+        return server, api
+
+    yield start
+    for server in servers:
+        server.close()
+
+
+def test_idempotent_call_retries_5xx_per_attempt(serve):
+    server, api = serve(_respond(503))
+    with pytest.raises(requests.HTTPError):
+        api.validate_image("diag-1")
+    assert server.requests == 3
+    # 회로 차단기는 시도마다 실패를 기록
+    assert api.guards["fastapi"].breaker.failures == 3
+    assert api.fastapi_session.stats.snapshot()["retries"] == 2
+
+
+def test_retries_stop_when_circuit_opens(serve):
+    server, api = serve(_respond(503), failure_threshold=2)
+    with pytest.raises(CircuitOpenError):
+        api.validate_image("diag-1")
+    assert server.requests == 2
+
+
+def test_non_idempotent_call_is_not_retried(serve):
+    server, api = serve(_respond(503))
+    with pytest.raises(requests.HTTPError):
+        api.submit_other_symptoms("diag-1", "열이 나요")
+    assert server.requests == 1
+
+
+def test_dropped_connection_is_retried(serve):
+    server, api = serve(_drop_connection)
+    with pytest.raises(requests.ConnectionError):
+        api.validate_image("diag-1")
+    assert server.requests == 3
+
+
+def test_read_timeout_is_not_retried(serve):
+    server, api = serve(_hang)
+    with pytest.raises(requests.ReadTimeout):
+        api.validate_image("diag-1")
+    assert server.requests == 1
+
+
+def test_connection_failures_are_retried_only_by_adapter(serve, monkeypatch):
+    server, api = serve(_respond(200))
+    attempts = []
+
+    def refuse(*args, **kwargs):
+        attempts.append(args[0])
+        raise ConnectionRefusedError("refused")
+
+    monkeypatch.setattr(urllib3.util.connection, "create_connection", refuse)
+    monkeypatch.setattr("urllib3.connection.connection.create_connection", refuse)
+    with pytest.raises(requests.ConnectionError):
+        api.validate_image("diag-1")
+    assert len(attempts) == 1 + CONFIG.max_retries
+    assert api.guards["fastapi"].breaker.failures == 1
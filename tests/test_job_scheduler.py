@@ -0,0 +1,166 @@
+import threading
+
+import pytest
+
+from services.job_scheduler import JobCancelled, JobScheduler, JobStatus, QueueFullError
+
+TIMEOUT = 5
+
+
+def _blocking(release: threading.Event, result="done"):
+    def fn(job):
+        while not release.wait(0.01):
+            job.check_cancelled()
+        return result
+    return fn
+
+
+def test_submit_joins_running_job_and_reruns_after_finish():
+    scheduler = JobScheduler(max_workers=1)
+    release = threading.Event()
+    first = scheduler.submit("rag:1", _blocking(release))
+    assert scheduler.submit("rag:1", _blocking(release, "other")) is first
+    release.set()
+    assert first.get_result(TIMEOUT) == "done"
+
+    second = scheduler.submit("rag:1", lambda job: "again")
+    assert second is not first
+    assert second.get_result(TIMEOUT) == "again"
+
+
+def test_forget_cancels_running_job_and_drops_key_once_finished():
+    scheduler = JobScheduler(max_workers=1)
+    job = scheduler.submit("rag:1", _blocking(threading.Event()))
+    scheduler.forget("rag:1")
+    assert job.wait(TIMEOUT)
+    assert job.status == JobStatus.CANCELLED
+    with pytest.raises(JobCancelled):
+        job.get_result()
+    scheduler.forget("rag:1")
+    assert scheduler.get("rag:1") is None
+    scheduler.forget("missing")
+
+
+def test_resubmit_after_forget_runs_after_cancelled_job_finishes():
+    scheduler = JobScheduler(max_workers=2)
+    running = []
+    stop_old = threading.Event()
+
+    def old(job):
+        running.append("old")
+        # 백엔드 응답을 기다리는 동안에는 취소를 알아차리지 못함
+        stop_old.wait(TIMEOUT)
+        running.remove("old")
+        job.check_cancelled()
+
+    def new(job):
+        return list(running)
+
+    first = scheduler.submit("rag:1", old)
+    while not running:
+        first.wait(0.01)
+    scheduler.forget("rag:1")
+    assert scheduler.get("rag:1") is first
+
+    second = scheduler.submit("rag:1", new)
+    assert second is not first
+    # 취소 요청된 작업에는 합류하지 않고, 새 작업에는 합류
+    assert scheduler.submit("rag:1", new) is second
+    assert not second.wait(0.2)
+    stop_old.set()
+    assert second.get_result(TIMEOUT) == []
+    assert first.status == JobStatus.CANCELLED
+
+
+def test_forget_cancels_job_waiting_for_previous_one():
+    scheduler = JobScheduler(max_workers=2)
+    release = threading.Event()
+    first = scheduler.submit("rag:1", lambda job: release.wait(TIMEOUT))
+    while first.status == JobStatus.PENDING:
+        first.wait(0.01)
+    scheduler.forget("rag:1")
+    second = scheduler.submit("rag:1", lambda job: "second")
+    scheduler.forget("rag:1")
+    assert second.wait(TIMEOUT)
+    assert second.status == JobStatus.CANCELLED
+    assert not first.done
+    release.set()
+    assert first.wait(TIMEOUT)
+
+
+def test_cancel_pending_job_finishes_immediately():
+    scheduler = JobScheduler(max_workers=1)
+    release = threading.Event()
+    scheduler.submit("a", _blocking(release))
+    pending = scheduler.submit("b", lambda job: "b")
+    assert scheduler.cancel("b")
+    assert pending.status == JobStatus.CANCELLED
+    release.set()
+    assert not scheduler.cancel("b")
+
+
+def test_queue_full_raises():
+    scheduler = JobScheduler(max_workers=1, max_queue=1)
+    release = threading.Event()
+    running = scheduler.submit("a", _blocking(release))
+    while running.status == JobStatus.PENDING:
+        running.wait(0.01)
+    scheduler.submit("b", _blocking(release))
+    with pytest.raises(QueueFullError):
+        scheduler.submit("c", _blocking(release))
+    assert scheduler.get("c") is None
+    release.set()
+
+
+def test_pools_do_not_block_each_other():
+    scheduler = JobScheduler(max_workers=1, pools={"stream": 1})
+    release = threading.Event()
+    stream = scheduler.submit("rag:1", _blocking(release), pool="stream")
+    analyze = scheduler.submit("analyze:1", lambda job: "analyzed")
+    assert analyze.get_result(TIMEOUT) == "analyzed"
+    assert not stream.done
+    stats = scheduler.stats()
+    assert stats["running"] == 1 and stats["queued_stream"] == 0 and stats["queued"] == 0
+    release.set()
+    assert stream.get_result(TIMEOUT) == "done"
+
+
+def test_failed_job_raises_its_error():
+    scheduler = JobScheduler(max_workers=1)
+
+    def fail(job):
+        raise ValueError("boom")
+
+    job = scheduler.submit("a", fail)
+    with pytest.raises(ValueError, match="boom"):
+        job.get_result(TIMEOUT)
+    assert job.status == JobStatus.FAILED
+
+
+def test_events_are_streamed_and_dropped_on_finish():
+    scheduler = JobScheduler(max_workers=1)
+    release = threading.Event()
+
+    def fn(job):
+        for i in range(3):
+            job.report(i)
+        release.wait(TIMEOUT)
+        job.report(3)
+        return "done"
+
+    def on_idle():
+        # 앞의 이벤트를 모두 받은 뒤 더 오지 않는 동안 호출되면 작업을 끝냄
+        idle_calls.append(len(received))
+        if len(received) == 3:
+            release.set()
+
+    idle_calls = []
+    received = []
+    job = scheduler.submit("a", fn)
+    for event in job.iter_events(poll_interval=0.01, on_idle=on_idle):
+        received.append(event)
+    assert received[:3] == [0, 1, 2]
+    assert 3 in idle_calls
+    assert job.result == "done"
+    assert job.events_since(0) == []
+    assert job.fn is None
@@ -0,0 +1,117 @@
+import io
+import os
+
+import pytest
+
+from services.multipart import MultipartEncoder, sniff_content_type
+
+JPEG = b"\xff\xd8\xff\xe0" + bytes(range(256)) * 40
+
+
+def _expected(encoder, payload, content_type="image/jpeg"):
+    boundary = encoder.boundary.encode()
+    return (
+        b"--" + boundary + b'\r\nContent-Disposition: form-data; name="body_part"\r\n\r\n'
+        + "팔".encode("utf-8") + b"\r\n"
+        + b"--" + boundary + b'\r\nContent-Disposition: form-data; name="image"; filename="a.jpg"\r\n'
+        + b"Content-Type: " + content_type.encode() + b"\r\n\r\n"
+        + payload + b"\r\n--" + boundary + b"--\r\n"
+    )
+
+
+def _encoder(source, **kwargs):
+    return MultipartEncoder({"body_part": "팔"}, "image", source, "a.jpg", **kwargs)
+
+
+class _PlainFile(io.RawIOBase):
+    """getbuffer가 없는 파일 객체"""
+
+    def __init__(self, data: bytes):
+        self._file = io.BytesIO(data)
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def seek(self, offset, whence=os.SEEK_SET):
+        return self._file.seek(offset, whence)
+
+    def tell(self):
+        return self._file.tell()
+
+    def read(self, size=-1):
+        return self._file.read(size)
+
+
+@pytest.mark.parametrize("make_source", [
+    lambda: JPEG,
+    lambda: bytearray(JPEG),
+    lambda: memoryview(JPEG),
+    lambda: io.BytesIO(JPEG),
+    lambda: _PlainFile(JPEG),
+], ids=["bytes", "bytearray", "memoryview", "BytesIO", "file"])
+def test_body_matches_expected_multipart(make_source):
+    with _encoder(make_source(), chunk_size=1000) as encoder:
+        body = b"".join(encoder)
+        assert body == _expected(encoder, JPEG)
+        assert len(encoder) == len(body)
+        assert encoder.headers == {"Content-Type": f"multipart/form-data; boundary={encoder.boundary}",
+                                   "Content-Length": str(len(body))}
+        assert max(len(chunk) for chunk in encoder) <= 1000
+
+
+def test_file_part_starts_at_current_position():
+    source = _PlainFile(b"junk" + JPEG)
+    source.seek(4)
+    with _encoder(source) as encoder:
+        assert b"".join(encoder) == _expected(encoder, JPEG)
+
+
+def test_seek_and_read_resend_from_any_offset():
+    with _encoder(JPEG, chunk_size=300) as encoder:
+        body = _expected(encoder, JPEG)
+        assert encoder.read(10) == body[:10]
+        assert encoder.tell() == 10
+        encoder.seek(-5, os.SEEK_END)
+        assert encoder.read() == body[-5:]
+        assert encoder.read() == b""
+        encoder.seek(100)
+        encoder.seek(50, os.SEEK_CUR)
+        assert encoder.read(1000) == body[150:450]
+        encoder.seek(0)
+        assert b"".join(iter(lambda: encoder.read(77), b"")) == body
+
+
+def test_close_releases_bytesio_buffer():
+    source = io.BytesIO(JPEG)
+    encoder = _encoder(source)
+    with pytest.raises(BufferError):
+        source.write(b"x")
+    encoder.close()
+    source.seek(0, os.SEEK_END)
+    source.write(b"x")
+
+
+def test_explicit_content_type_skips_sniffing():
+    with _encoder(b"GIF89a....", content_type="image/png") as encoder:
+        assert encoder.file_content_type == "image/png"
+        assert b"".join(encoder) == _expected(encoder, b"GIF89a....", "image/png")
+
+
+@pytest.mark.parametrize("head, content_type", [
+    (b"\xff\xd8\xff\xdb" + b"\x00" * 12, "image/jpeg"),
+    (b"\x89PNG\r\n\x1a\n" + b"\x00" * 8, "image/png"),
+    (b"RIFF\x00\x00\x00\x00WEBPVP8 ", "image/webp"),
+    (b"GIF89a" + b"\x00" * 10, "image/gif"),
+    (b"RIFF\x00\x00\x00\x00WAVEfmt ", "image/jpeg"),
+    (b"WXYZ\x00\x00\x00\x00WEBP", "image/jpeg"),
+    (b"", "image/jpeg"),
+])
+def test_sniff_content_type(head, content_type):
+    assert sniff_content_type(head) == content_type
+
+
+def test_sniff_content_type_default():
+    assert sniff_content_type(b"plain text", default="application/octet-stream") == "application/octet-stream"
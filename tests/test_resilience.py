@@ -0,0 +1,117 @@
+import random
+
+import pytest
+
+from services.resilience import (
+    AdaptiveConcurrencyLimiter,
+    BackendBusyError,
+    CircuitBreaker,
+    CircuitOpenError,
+)
+
+
+@pytest.mark.parametrize("sigma", [0.3, 0.5, 1.0])
+def test_limiter_keeps_limit_under_light_load_with_jitter(sigma, clock):
+    limiter = AdaptiveConcurrencyLimiter("fastapi", initial_limit=32, clock=clock)
+    rng = random.Random(1)
+    for _ in range(3000):
+        limiter.acquire()
+        latency = 0.05 * rng.lognormvariate(0, sigma)
+        clock.now += latency
+        limiter.release("op", latency, failed=False)
+    assert limiter.limit == 32
+
+
+def _run_overloaded(limiter, clock, clients=60, steps=20000, capacity=10):
+    # 동시 요청이 capacity개를 넘으면 백엔드 지연 시간이 비례해서 늘어나는 상황
+    rng = random.Random(2)
+    history = []
+    for _ in range(steps):
+        while limiter.inflight < min(int(limiter.limit), clients):
+            limiter.acquire()
+        inflight = limiter.inflight
+        latency = 0.05 * max(1.0, inflight / capacity) * rng.lognormvariate(0, 0.2)
+        clock.now += latency / inflight
+        limiter.release("op", latency, failed=False)
+        history.append(limiter.limit)
+    return history
+
+
+def test_limiter_settles_below_demand_when_backend_slows_with_concurrency(clock):
+    limiter = AdaptiveConcurrencyLimiter("fastapi", initial_limit=4, clock=clock)
+    recent = _run_overloaded(limiter, clock)[-5000:]
+    assert 10 <= min(recent)
+    assert max(recent) < 60
+
+
+def test_limiter_shrinks_when_backend_capacity_drops(clock):
+    limiter = AdaptiveConcurrencyLimiter("fastapi", initial_limit=4, clock=clock)
+    before = _run_overloaded(limiter, clock, capacity=20)[-5000:]
+    after = _run_overloaded(limiter, clock, capacity=5, steps=5000)[-1000:]
+    assert max(after) < min(before)
+
+
+def test_limiter_decreases_on_failure_at_most_once_per_interval(clock):
+    limiter = AdaptiveConcurrencyLimiter("springboot", initial_limit=10, decrease_interval=1.0, clock=clock)
+    for _ in range(5):
+        limiter.acquire()
+        limiter.release("op", None, failed=True)
+    assert limiter.limit == pytest.approx(8.0)
+    clock.now = 1.0
+    limiter.acquire()
+    limiter.release("op", None, failed=True)
+    assert limiter.limit == pytest.approx(6.4)
+
+
+def test_limiter_rejects_after_queue_timeout():
+    limiter = AdaptiveConcurrencyLimiter("springboot", initial_limit=1, queue_timeout=0.0)
+    limiter.acquire()
+    with pytest.raises(BackendBusyError):
+        limiter.acquire()
+    assert limiter.rejected == 1
+    limiter.release("op", 0.01, failed=False)
+    limiter.acquire()
+
+
+def test_circuit_opens_after_consecutive_failures(clock):
+    breaker = CircuitBreaker("springboot", failure_threshold=3, reset_timeout=30, clock=clock)
+    for _ in range(2):
+        breaker.before_call()
+        breaker.record_failure()
+    breaker.before_call()
+    breaker.record_success()
+    for _ in range(3):
+        breaker.before_call()
+        breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    clock.now = 10
+    with pytest.raises(CircuitOpenError) as info:
+        breaker.before_call()
+    assert info.value.retry_after == pytest.approx(20)
+
+
+def test_half_open_allows_single_probe_and_recovers(clock):
+    breaker = CircuitBreaker("fastapi", failure_threshold=1, reset_timeout=30, clock=clock)
+    breaker.before_call()
+    breaker.record_failure()
+    clock.now = 30
+    breaker.before_call()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.before_call()
+
+
+def test_failed_probe_reopens_circuit(clock):
+    breaker = CircuitBreaker("fastapi", failure_threshold=5, reset_timeout=30, clock=clock)
+    for _ in range(5):
+        breaker.before_call()
+        breaker.record_failure()
+    clock.now = 31
+    breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
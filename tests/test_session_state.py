@@ -0,0 +1,73 @@
+from services.catalog import SYMPTOMS
+from services.session_state import DiagnosisSession, SessionStore
+
+
+def test_symptom_bits_keep_catalog_order():
+    session = DiagnosisSession()
+    last, first = SYMPTOMS.enums[-1], SYMPTOMS.enums[0]
+    session.set_symptom(last, True)
+    session.set_symptom(first, True)
+    session.set_symptom(first, True)
+    assert session.selected_symptoms() == [first, last]
+    assert session.has_symptom(last)
+    session.set_symptom(first, False)
+    assert not session.has_symptom(first)
+    assert session.selected_symptoms() == [last]
+
+
+def test_reset_keeps_session_id():
+    session = DiagnosisSession()
+    session_id = session.session_id
+    session.current_step = 3
+    session.diagnosis_id = "d1"
+    session.set_symptom(SYMPTOMS.enums[0], True)
+    session.reset()
+    assert session.session_id == session_id
+    assert (session.current_step, session.diagnosis_id, session.symptom_bits) == (1, None, 0)
+    assert DiagnosisSession().session_id != session_id
+
+
+def test_store_evicts_least_recently_used_over_max_bytes(clock):
+    store = SessionStore(max_bytes=100, idle_seconds=900, clock=clock)
+    store.put("a", "image", "A", 40)
+    store.put("b", "image", "B", 40)
+    store.touch("a")
+    store.put("c", "image", "C", 40)
+    assert store.get("b", "image") is None
+    assert store.get("a", "image") == "A"
+    assert store.get("c", "image") == "C"
+    assert store.stats() == {"sessions": 2, "bytes": 80, "evicted": 1}
+
+
+def test_store_keeps_current_session_even_if_it_alone_exceeds_max_bytes(clock):
+    store = SessionStore(max_bytes=100, clock=clock)
+    store.put("a", "image", "A", 40)
+    store.put("b", "image", "B", 150)
+    assert store.get("a", "image") is None
+    assert store.get("b", "image") == "B"
+
+
+def test_store_evicts_idle_sessions(clock):
+    store = SessionStore(idle_seconds=60, clock=clock)
+    store.put("a", "image", "A", 10)
+    clock.now = 30
+    store.put("b", "image", "B", 10)
+    clock.now = 70
+    store.touch("b")
+    assert store.get("a", "image") is None
+    assert store.get("b", "image") == "B"
+    assert store.stats()["evicted"] == 1
+
+
+def test_replace_and_discard_update_size(clock):
+    store = SessionStore(clock=clock)
+    store.put("a", "image", "A", 40)
+    store.put("a", "image", "A2", 10)
+    store.put("a", "thumb", "T", 5)
+    assert store.stats()["bytes"] == 15
+    store.discard("a", "thumb")
+    assert store.get("a", "thumb") is None
+    assert store.stats()["bytes"] == 10
+    store.discard("a")
+    store.discard("missing")
+    assert store.stats() == {"sessions": 0, "bytes": 0, "evicted": 0}
@@ -0,0 +1,88 @@
+import pytest
+
+from services.sse import SSEEvent, SSEParser, TextAccumulator, parse_json_data
+
+STREAM = (
+    b": keep-alive\n"
+    b"data: {\"chunk\": \"\xec\x95\x88\xeb\x85\x95\"}\n\n"
+    b"id: 7\n"
+    b"event: update\n"
+    b"data: first\n"
+    b"data:second\n\n"
+    b"retry: 3000\n"
+    b"data: third\n\n"
+)
+
+EXPECTED = [
+    SSEEvent('{"chunk": "안녕"}'),
+    SSEEvent("first\nsecond", "update", "7"),
+    SSEEvent("third", "message", "7", 3000),
+]
+
+
+def _parse(chunks):
+    return list(SSEParser().iter_events(chunks))
+
+
+@pytest.mark.parametrize("newline", [b"\n", b"\r\n", b"\r"])
+def test_line_endings(newline):
+    assert _parse([STREAM.replace(b"\n", newline)]) == EXPECTED
+
+
+@pytest.mark.parametrize("newline", [b"\n", b"\r\n", b"\r"])
+def test_result_does_not_depend_on_chunk_boundaries(newline):
+    stream = STREAM.replace(b"\n", newline)
+    for split in range(1, len(stream)):
+        assert _parse([stream[:split], stream[split:]]) == EXPECTED, split
+    assert _parse([stream[i:i + 1] for i in range(len(stream))]) == EXPECTED
+
+
+def test_trailing_cr_is_held_until_close():
+    parser = SSEParser()
+    assert parser.feed(b"data: x\r\r") == []
+    assert parser.close() == [SSEEvent("x")]
+
+
+def test_crlf_split_across_chunks_is_one_line_end():
+    parser = SSEParser()
+    assert parser.feed(b"data: x\r") == []
+    assert parser.feed(b"\n\r") == []
+    assert parser.feed(b"\ndata: y\n\n") == [SSEEvent("x"), SSEEvent("y")]
+
+
+def test_close_drops_unterminated_event():
+    parser = SSEParser()
+    assert parser.feed(b"data: partial\n") == []
+    assert parser.close() == []
+    assert parser.feed(b"data: next\n\n") == [SSEEvent("next")]
+
+
+def test_field_edge_cases():
+    events = _parse([
+        b"data\n\n"            # 값 없는 data 필드는 빈 문자열
+        b"event: ping\n\n"     # data가 없으면 디스패치하지 않고 타입만 초기화
+        b"id: a\x00b\n"        # NULL이 들어간 id는 무시
+        b"retry: soon\n"       # 숫자가 아닌 retry는 무시
+        b"unknown: 1\n"
+        b"data:  two spaces\n\n"
+    ])
+    assert events == [SSEEvent(""), SSEEvent(" two spaces")]
+
+
+def test_parse_json_data_skips_non_json_events():
+    assert parse_json_data(SSEEvent('{"chunk": "a"}')) == {"chunk": "a"}
+    assert parse_json_data(SSEEvent("[DONE]")) is None
+    assert parse_json_data(SSEEvent("")) is None
+
+
+def test_text_accumulator_caches_joined_value():
+    text = TextAccumulator()
+    assert text.getvalue() == ""
+    for part in ("a", "b", "c"):
+        text.append(part)
+    assert len(text) == 3
+    assert text.getvalue() == "abc"
+    text.append("d")
+    assert str(text) == "abcd"
+    text.clear()
+    assert text.getvalue() == ""
@@ -0,0 +1,35 @@
+from services.stream_render import ThrottledRenderer
+
+
+def test_chunk_inside_interval_is_rendered_by_tick(clock):
+    shown = []
+    renderer = ThrottledRenderer(shown.append, min_interval=0.05, max_pending_chars=2000, clock=clock)
+    renderer.push("first ")
+    clock.now = 0.01
+    renderer.push("second ")
+    assert shown == ["first "]
+
+    renderer.tick()
+    assert shown == ["first "]
+    clock.now = 0.06
+    renderer.tick()
+    assert shown == ["first ", "first second "]
+    renderer.tick()
+    assert len(shown) == 2
+
+
+def test_max_pending_chars_renders_immediately(clock):
+    shown = []
+    renderer = ThrottledRenderer(shown.append, min_interval=10, max_pending_chars=5, clock=clock)
+    renderer.push("a")
+    renderer.push("bc")
+    renderer.push("defgh")
+    assert shown == ["a", "abcdefgh"]
+
+
+def test_exit_flushes_pending_text(clock):
+    shown = []
+    with ThrottledRenderer(shown.append, min_interval=10, max_pending_chars=2000, clock=clock) as renderer:
+        renderer.push("a")
+        renderer.push("b")
+    assert shown == ["a", "ab"]